@@ -4,16 +4,19 @@ Porpulsion agent entrypoint.
 Initialises runtime config (TLS, invite token, env vars) into the shared
 state module, registers Flask blueprints, and starts the HTTP server.
 """
+import concurrent.futures
+import dataclasses
 import hashlib
+import json
 import logging
 import os
 import pathlib
 import socket
 import threading
 
-from flask import Flask, render_template, Response, jsonify
+from flask import Flask, render_template, request, Response
 
-from porpulsion import state, tls
+from porpulsion import json_utils, state, tls
 from porpulsion.log_buffer import install_log_handler
 from porpulsion.routes import peers as peers_bp
 from porpulsion.routes import workloads as workloads_bp
@@ -35,17 +38,25 @@ log = logging.getLogger("porpulsion.agent")
 state.AGENT_NAME = os.environ.get("AGENT_NAME", "porpulsion-agent")
 state.NAMESPACE  = os.environ.get("PORPULSION_NAMESPACE", "porpulsion")
 
-_self_url_env = os.environ.get("SELF_URL", "")
-if _self_url_env:
-    state.SELF_URL = _self_url_env
-else:
+def _probe_ip() -> str:
+    """Best-effort primary interface IP via a UDP connect (no packet is sent)."""
     try:
         _s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         _s.connect(("8.8.8.8", 80))
-        _detected_ip = _s.getsockname()[0]
+        ip = _s.getsockname()[0]
         _s.close()
+        return ip
     except Exception:
-        _detected_ip = "127.0.0.1"
+        return "127.0.0.1"
+
+
+_self_url_env = os.environ.get("SELF_URL", "")
+if _self_url_env:
+    state.SELF_URL = _self_url_env
+else:
+    # POD_IP is injected by the Helm chart via the downward API, so the usual
+    # in-cluster case never touches the network.
+    _detected_ip = os.environ.get("POD_IP") or _probe_ip()
     state.SELF_URL = f"http://{_detected_ip}:8000"
     log.warning(
         "SELF_URL not set — auto-detected as %s. "
@@ -55,12 +66,20 @@ else:
         state.SELF_URL
     )
 
-# Load invite token from k8s Secret (generate if absent)
-state.invite_token = tls.load_or_generate_token(state.NAMESPACE)
-
-# Load CA cert from k8s Secret (generate if absent).
-# The CA cert is exchanged during peering and used to authenticate the WS channel.
-_CA_PEM, _CA_KEY_PEM = tls.load_or_generate_ca(state.AGENT_NAME, state.NAMESPACE)
+# Load everything persisted in k8s up front. Each call is an independent API
+# round-trip, so run them concurrently rather than back to back:
+#   - invite token from the credentials Secret (generated if absent)
+#   - CA cert from the credentials Secret (generated if absent). The CA cert is
+#     exchanged during peering and used to authenticate the WS channel.
+#   - persisted peers and the state ConfigMap (restored below)
+with concurrent.futures.ThreadPoolExecutor(max_workers=4) as _pool:
+    _f_token = _pool.submit(tls.load_or_generate_token, state.NAMESPACE)
+    _f_ca    = _pool.submit(tls.load_or_generate_ca, state.AGENT_NAME, state.NAMESPACE)
+    _f_peers = _pool.submit(tls.load_peers, state.NAMESPACE)
+    _f_saved = _pool.submit(tls.load_state_configmap, state.NAMESPACE)
+
+state.invite_token = _f_token.result()
+_CA_PEM, _CA_KEY_PEM = _f_ca.result()
 
 state.AGENT_CA_PEM = _CA_PEM
 
@@ -82,11 +101,11 @@ log.info("SELF_URL=%s  VERSION_HASH=%s", state.SELF_URL, state.VERSION_HASH)
 
 from porpulsion.models import Peer, RemoteApp, RemoteAppSpec  # noqa: E402
 
-for _p in tls.load_peers(state.NAMESPACE):
+for _p in _f_peers.result():
     state.peers[_p["name"]] = Peer(
         name=_p["name"], url=_p["url"], ca_pem=_p.get("ca_pem", ""))
 
-_saved = tls.load_state_configmap(state.NAMESPACE)
+_saved = _f_saved.result()
 for _a in _saved.get("local_apps", []):
     _ra = RemoteApp(
         id=_a["id"], name=_a["name"],
@@ -96,10 +115,10 @@ for _a in _saved.get("local_apps", []):
         created_at=_a.get("created_at", ""), updated_at=_a.get("updated_at", ""),
     )
     state.local_apps[_ra.id] = _ra
-if "settings" in _saved:
-    for _k, _v in _saved["settings"].items():
-        if hasattr(state.settings, _k):
-            setattr(state.settings, _k, _v)
+_settings_fields = {f.name for f in dataclasses.fields(state.settings)}
+for _k, _v in _saved.get("settings", {}).items():
+    if _k in _settings_fields:
+        setattr(state.settings, _k, _v)
 for _entry in _saved.get("pending_approval", []):
     if _entry.get("id"):
         state.pending_approval[_entry["id"]] = _entry
@@ -108,14 +127,15 @@ log.info("Restored %d peer(s), %d local app(s), %d pending approval(s) from pers
          len(state.peers), len(state.local_apps), len(state.pending_approval))
 
 # Re-open WS channels for any peers restored from persistent storage.
-# Runs after the Flask app starts (deferred so the WS endpoint is registered).
+# Runs once the peer server is listening (so the WS endpoint is reachable).
 # Both sides attempt outbound — whichever connects first stays up. If the peer
 # also connects inbound simultaneously, accept_channel replaces the outbound
 # channel cleanly. This ensures reconnection works regardless of which side
 # restarted.
 def _reconnect_persisted_peers():
-    import time as _time
-    _time.sleep(3)  # let the server fully start before connecting outbound
+    from porpulsion.peer_server import ready as _peer_server_ready
+    if not _peer_server_ready.wait(timeout=10):
+        log.warning("Peer server not listening after 10s — reconnecting to peers anyway")
     from porpulsion.channel import open_channel_to
     for _p in state.peers.values():
         log.info("Re-opening WS channel to persisted peer %s", _p.name)
@@ -129,6 +149,12 @@ app = Flask(__name__,
             template_folder=str(_TEMPLATES),
             static_folder=str(_STATIC),
             static_url_path="/static")
+# Templates and static files only change with a new image — skip the per-request
+# mtime checks and let browsers cache /static for an hour.
+app.config["TEMPLATES_AUTO_RELOAD"] = False
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 3600
+app.jinja_env.auto_reload = False
+json_utils.install(app)
 
 app.register_blueprint(peers_bp.bp, url_prefix="/api")
 app.register_blueprint(workloads_bp.bp, url_prefix="/api")
@@ -140,18 +166,95 @@ app.register_blueprint(ui_bp.bp)
 
 
 
+def _spec_response(body: bytes, mimetype: str) -> Response:
+    """Cached spec body, gzipped when the client accepts it, with an ETag for 304s."""
+    from porpulsion.openapi_spec import get_openapi_etag, get_openapi_gzip
+    if request.accept_encodings["gzip"]:
+        resp = Response(get_openapi_gzip(body), mimetype=mimetype)
+        resp.headers["Content-Encoding"] = "gzip"
+        # Distinct ETag per encoding so caches never mix the two representations
+        etag = get_openapi_etag(body) + "-gz"
+    else:
+        resp = Response(body, mimetype=mimetype)
+        etag = get_openapi_etag(body)
+    resp.headers["Vary"] = "Accept-Encoding"
+    resp.set_etag(etag)
+    return resp.make_conditional(request)
+
+
 @app.route("/api/openapi.json")
 def openapi_json():
     """Serve generated OpenAPI 3 spec (JSON)."""
-    from porpulsion.openapi_spec import get_openapi_dict
-    return jsonify(get_openapi_dict())
+    from porpulsion.openapi_spec import get_openapi_json_bytes
+    return _spec_response(get_openapi_json_bytes(), "application/json")
 
 
 @app.route("/api/openapi.yaml")
 def openapi_yaml():
     """Serve generated OpenAPI 3 spec (YAML)."""
-    from porpulsion.openapi_spec import get_openapi_yaml
-    return Response(get_openapi_yaml(), mimetype="application/x-yaml")
+    from porpulsion.openapi_spec import get_openapi_yaml_bytes
+    return _spec_response(get_openapi_yaml_bytes(), "application/x-yaml")
+
+
+# Restored apps that aren't Ready yet get this long before we report Timeout.
+_RESTORE_READY_TIMEOUT = 120
+
+# Status reports from the restore watcher run here so the watch stream never
+# stalls behind a peer whose channel is still reconnecting (get_channel waits).
+_report_pool = concurrent.futures.ThreadPoolExecutor(
+    max_workers=8, thread_name_prefix="ra-watch")
+
+
+def _watch_restored_deployments(waiting: dict, resource_version: str | None):
+    """
+    Single watcher for every restored RemoteApp that wasn't Ready yet.
+
+    waiting maps app_id -> (ra, callback_url, peer, desired). Streams the
+    labelled Deployments once, starting from the list's resourceVersion, and
+    reports Ready as each app reaches its desired replica count. Apps still
+    waiting when the deadline passes are reported as Timeout.
+    """
+    import time as _time
+    from kubernetes import watch as _k8s_watch
+    from kubernetes.client import ApiException
+    from porpulsion.k8s import executor as _ex
+
+    deadline = _time.monotonic() + _RESTORE_READY_TIMEOUT
+    while waiting:
+        remaining = int(deadline - _time.monotonic())
+        if remaining <= 0:
+            break
+        kwargs = {"label_selector": "porpulsion.io/remote-app-id",
+                  "timeout_seconds": remaining}
+        if resource_version:
+            kwargs["resource_version"] = resource_version
+        w = _k8s_watch.Watch()
+        try:
+            for event in w.stream(_ex.apps_v1.list_namespaced_deployment,
+                                  state.NAMESPACE, **kwargs):
+                d = event["object"]
+                resource_version = d.metadata.resource_version
+                app_id = (d.metadata.labels or {}).get("porpulsion.io/remote-app-id", "")
+                entry = waiting.get(app_id)
+                if entry and (d.status.ready_replicas or 0) >= entry[3]:
+                    del waiting[app_id]
+                    ra, callback_url, peer, _ = entry
+                    _report_pool.submit(_ex._report_status, ra, callback_url, "Ready", peer=peer)
+                    if not waiting:
+                        w.stop()
+        except ApiException as exc:
+            if exc.status == 410:
+                # resourceVersion expired — restart the stream from the current state
+                resource_version = None
+                continue
+            log.warning("Deployment watch failed: %s", exc.reason)
+            break
+        except Exception as exc:
+            log.warning("Deployment watch failed: %s", exc)
+            break
+
+    for ra, callback_url, peer, _ in waiting.values():
+        _report_pool.submit(_ex._report_status, ra, callback_url, "Timeout", peer=peer)
 
 
 def _reconstruct_remote_apps():
@@ -164,62 +267,59 @@ def _reconstruct_remote_apps():
     Runs as a daemon thread so it doesn't block startup.
     """
     try:
-        from kubernetes import client as _k8s, config as _kube_config
-        try:
-            _kube_config.load_incluster_config()
-        except Exception:
-            _kube_config.load_kube_config()
-        apps_v1 = _k8s.AppsV1Api()
-        deploys = apps_v1.list_namespaced_deployment(
+        from porpulsion.k8s.executor import apps_v1
+        # Skip the client's model deserialisation — we only need a few fields
+        # per Deployment, so read them straight from the raw JSON.
+        resp = apps_v1.list_namespaced_deployment(
             state.NAMESPACE,
             label_selector="porpulsion.io/remote-app-id",
+            _preload_content=False,
+            _request_timeout=30,
         )
+        deploys = json.loads(resp.data)
         restored = 0
-        for dep in deploys.items:
-            labels = dep.metadata.labels or {}
+        waiting: dict[str, tuple] = {}
+        for dep in deploys.get("items", []):
+            meta   = dep.get("metadata") or {}
+            labels = meta.get("labels") or {}
             app_id      = labels.get("porpulsion.io/remote-app-id", "")
             source_peer = labels.get("porpulsion.io/source-peer", "unknown")
             if not app_id or app_id in state.remote_apps:
                 continue
-            ready   = dep.status.ready_replicas or 0
-            desired = dep.spec.replicas or 1
+            ready   = (dep.get("status") or {}).get("readyReplicas") or 0
+            desired = (dep.get("spec") or {}).get("replicas") or 1
             # Reconstruct name from deploy_name: "ra-{id}-{name}" → strip prefix
-            deploy_name = dep.metadata.name
-            name = deploy_name[len(f"ra-{app_id}-"):] if deploy_name.startswith(f"ra-{app_id}-") else deploy_name
+            deploy_name = meta.get("name", "")
+            prefix = f"ra-{app_id}-"
+            name = deploy_name[len(prefix):] if deploy_name.startswith(prefix) else deploy_name
             already_ready = ready >= desired
             ra = RemoteApp(
                 id=app_id, name=name, spec=RemoteAppSpec(image="", replicas=desired),
                 source_peer=source_peer,
                 status="Ready" if already_ready else "Running",
             )
+            # Keep the live object's name — the truncated name can't always be
+            # round-tripped through "ra-{id}-{name}"[:63].
+            ra.deploy_name = deploy_name
             state.remote_apps[app_id] = ra
 
-            # If not yet ready, find the source peer and resume polling so the
-            # status will eventually transition to Ready.
+            # If not yet ready, find the source peer and hand the app to the
+            # shared watcher so the status will eventually transition to Ready.
+            # (run_workload would restart the deployment — we only want to
+            # resume status tracking.)
             if not already_ready:
                 peer = state.peers.get(source_peer)
                 callback_url = peer.name if peer else ""
-                from porpulsion.k8s.executor import run_workload
-                # run_workload restarts the deployment — we only want to resume
-                # the status watcher. Kick a lightweight watcher thread instead.
-                def _watch(ra=ra, callback_url=callback_url, peer=peer, desired=desired):
-                    from porpulsion.k8s import executor as _ex
-                    import time as _time
-                    deploy_nm = f"ra-{ra.id}-{ra.name}"[:63]
-                    for _ in range(60):
-                        _time.sleep(2)
-                        try:
-                            d = _ex.apps_v1.read_namespaced_deployment_status(deploy_nm, state.NAMESPACE)
-                            if (d.status.ready_replicas or 0) >= desired:
-                                _ex._report_status(ra, callback_url, "Ready", peer=peer)
-                                return
-                        except Exception:
-                            pass
-                    _ex._report_status(ra, callback_url, "Timeout", peer=peer)
-                threading.Thread(target=_watch, daemon=True).start()
+                waiting[app_id] = (ra, callback_url, peer, desired)
 
             restored += 1
         log.info("Reconstructed %d remote app(s) from k8s Deployments", restored)
+        if waiting:
+            threading.Thread(
+                target=_watch_restored_deployments,
+                args=(waiting, (deploys.get("metadata") or {}).get("resourceVersion")),
+                daemon=True, name="ra-restore-watch",
+            ).start()
     except Exception as exc:
         log.warning("Could not reconstruct remote_apps from k8s: %s", exc)
 
@@ -241,4 +341,13 @@ if __name__ == "__main__":
     from porpulsion.peer_server import start as _start_peer_server
     threading.Thread(target=_start_peer_server, daemon=True, name="peer-server").start()
 
-    app.run(host="0.0.0.0", port=8000, threaded=True)
+    # Dashboard (port 8000) on the same bounded server as the peer port: a
+    # capped number of concurrent connections, idle keep-alives dropped,
+    # rather than app.run()'s unbounded thread per connection.
+    from porpulsion.peer_server import make_bounded_server
+    log.info("Starting dashboard server on port %d", 8000)
+    make_bounded_server(
+        "0.0.0.0", 8000, app,
+        max_connections=int(os.environ.get("PORPULSION_DASHBOARD_CONNECTIONS", "32")),
+        name="Dashboard server",
+    ).serve_forever()
@@ -12,13 +12,17 @@ upgrade is a plain HTTPS request (nginx handles it fine), and once the
 connection is established both sides authenticate via the CA cert check on
 the first frame. No client cert needs to reach the Flask app.
 
-Message framing (JSON):
+Message framing (JSON text frames, or msgpack binary frames once negotiated):
 
   Request  {"id": "<uuid4-hex>", "type": "<method>", "payload": {...}}
   Reply    {"id": "<same>",       "type": "reply",    "ok": true|false,
             "payload": {...},     "error": "<str>"}    # error only when ok=false
   Push     {"type": "<event>",   "payload": {...}}     # no id — fire-and-forget
 
+A msgpack binary frame may carry several messages packed back to back (the
+writer coalescing a burst); the receiver splits them with a streaming
+Unpacker. JSON text frames always carry exactly one message.
+
 Types:
   remoteapp/receive       submit a RemoteApp to the peer for execution
   remoteapp/status        status update from executor back to submitter
@@ -26,18 +30,46 @@ Types:
   remoteapp/scale         scale a RemoteApp
   remoteapp/detail        fetch k8s detail for a RemoteApp
   remoteapp/spec-update   push a new spec to the executor
-  proxy/request           HTTP proxy request (payload includes base64 body)
+  proxy/request           HTTP proxy request (body: raw bytes, or base64 on JSON)
   proxy/response          HTTP proxy response
   peer/disconnect         graceful disconnect notification
-  ping                    keepalive
+  stream/chunk            one piece of a streamed reply  {"id": <request id>, "data": <bytes>}
+  stream/end              end of a streamed reply        {"id": <request id>, "error": "<str>"}
+  ping                    keepalive from older peers (now RFC 6455 ping frames)
+
+Codec negotiation: the connecting side sends "X-Channel-Codec: msgpack" on
+the upgrade request. A server that understands it switches to msgpack
+binary frames straight away; the client switches on the first binary frame
+it receives. Either side always accepts both JSON text and msgpack binary
+frames, so an old peer on either end simply keeps talking JSON. On msgpack
+channels proxy bodies travel as raw bytes instead of base64 strings.
+
+Compression (msgpack only): peers list "zlib" in version/announce features.
+Once the peer has, binary frames of _COMPRESS_MIN bytes or more are sent
+zlib-compressed when that actually saves space. A compressed frame starts
+with the zlib header byte 0x78, which as msgpack would be a bare integer and
+can never begin a message, so the receiver tells them apart by that byte.
+
+Streamed replies (msgpack only): call_stream() marks the request with
+"stream": true. A handler that supports it returns a StreamReply; the normal
+reply goes out first, then the chunks as stream/chunk pushes and a final
+stream/end, all keyed by the request id. A handler that ignores the flag
+just replies in full, which call_stream() hands back unchanged.
 """
 import base64
+import collections
+import concurrent.futures
+import functools
 import json
 import logging
+import queue
+import socket
 import threading
 import time
 import uuid
+import zlib
 
+import msgpack
 import websocket  # websocket-client
 
 log = logging.getLogger("porpulsion.channel")
@@ -46,17 +78,28 @@ log = logging.getLogger("porpulsion.channel")
 class _SimpleWsSendAdapter:
     """
     Thin wrapper around a simple_websocket server socket that exposes
-    only the send() method needed by _send_raw and _ping_loop.
+    only the send methods needed by the writer thread.
     recv() is NOT delegated here — the inbound recv loop reads from the
     raw sock object directly to stay on the correct thread.
     """
 
+    __slots__ = ("_sock",)
+
     def __init__(self, sock):
         self._sock = sock
 
     def send(self, data: str):
         self._sock.send(data)
 
+    def send_binary(self, data: bytes):
+        # simple_websocket picks the opcode from the type: bytes -> binary frame
+        self._sock.send(data)
+
+    def ping(self):
+        # No-op: simple_websocket pings on its own (SOCK_SERVER_OPTIONS
+        # ping_interval on peer_app) and closes the socket if pongs stop.
+        pass
+
     def close(self):
         try:
             self._sock.close()
@@ -94,10 +137,123 @@ def _emit_version_mismatch(peer_name: str, peer_ver: str):
         log.debug("Could not emit version mismatch notification: %s", exc)
 
 
+@functools.lru_cache(maxsize=1)
+def _ca_header(ca_pem: bytes) -> str:
+    """Base64 X-Agent-Ca header value for our CA — encoded once, not per reconnect."""
+    return base64.b64encode(ca_pem).decode()
+
+
+# Kernel keepalive so a silently vanished peer is noticed in ~60s even between
+# pings; TCP_USER_TIMEOUT bounds how long unacked data may sit in the send queue.
+_SOCKOPTS = [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+]
+for _opt, _val in (("TCP_KEEPIDLE", 30), ("TCP_KEEPINTVL", 10),
+                   ("TCP_KEEPCNT", 3), ("TCP_USER_TIMEOUT", 45000)):
+    if hasattr(socket, _opt):   # Linux-only options
+        _SOCKOPTS.append((socket.IPPROTO_TCP, getattr(socket, _opt), _val))
+
+
+def _tune_socket(sk):
+    """Apply _SOCKOPTS to a channel's TCP socket; best-effort per option."""
+    if sk is None:
+        return
+    for level, opt, val in _SOCKOPTS:
+        try:
+            sk.setsockopt(level, opt, val)
+        except (OSError, AttributeError) as exc:
+            log.debug("setsockopt(%s, %s) failed: %s", level, opt, exc)
+
+
+def _json_bytes(obj):
+    """JSON has no bytes type: text-frame peers get base64 (see handle_proxy_request)."""
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return base64.b64encode(obj).decode()
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
+# Compact JSON for text-frame peers: no spaces after separators and raw UTF-8
+# instead of \uXXXX escapes, so frames are shorter on the wire. The codec is
+# chosen per frame by the writer, so bytes payloads built while the channel was
+# binary are base64-encoded here rather than by the caller.
+_json_encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False,
+                                default=_json_bytes).encode
+_json_decode = json.JSONDecoder().decode
+
+
+def _preencode(msg: dict) -> tuple[str, bytes]:
+    """Encode a constant frame once for both codecs; the writer picks one."""
+    return _json_encode(msg), msgpack.packb(msg, use_bin_type=True)
+
+
+def _as_json(msg) -> str:
+    return msg[0] if isinstance(msg, tuple) else _json_encode(msg)
+
+
+def _as_msgpack(msg, pack) -> bytes:
+    return msg[1] if isinstance(msg, tuple) else pack(msg)
+
+
+# Exact bytes of the app-level keepalive older peers still send every 20s —
+# matched before decoding so they never reach the parser or _dispatch.
+_LEGACY_PING_FRAMES = frozenset((
+    json.dumps({"type": "ping", "payload": {}}),
+    _json_encode({"type": "ping", "payload": {}}),
+))
+
+
+def _new_unpacker() -> msgpack.Unpacker:
+    """Streaming decoder for one connection's binary frames."""
+    return msgpack.Unpacker(raw=False)
+
+
+@functools.lru_cache(maxsize=1)
+def _version_frame(version: str) -> tuple[str, bytes]:
+    return _preencode({"type": "version/announce",
+                       "payload": {"version": version, "features": ["zlib"]}})
+
+
+_CODEC_HEADER = "X-Channel-Codec"
+_CODEC_MSGPACK = "msgpack"
+
+_ZLIB_MAGIC    = 0x78      # first byte of a zlib stream (deflate, 32K window)
+_COMPRESS_MIN  = 1024      # don't bother compressing frames smaller than this
+_COMPRESS_LEVEL = 1        # fastest level — most of the win on repetitive keys
+_MAX_INFLATED  = 64 * 1024 * 1024   # largest decompressed frame accepted from a peer
+
 _CONNECT_TIMEOUT = 5      # seconds for WS handshake
 _RECV_TIMEOUT    = 30     # seconds before treating connection as dead
 _RECONNECT_DELAY = (2, 4, 8, 16, 30)   # backoff steps in seconds
-_PING_INTERVAL   = 20     # seconds between keepalive pings
+PING_INTERVAL    = 20     # idle seconds before a WS protocol ping is sent
+_KEEPALIVE_TICK  = 1      # how often the shared keepalive thread checks channels
+_STABLE_AFTER    = 10     # a connection up this long redials without backoff
+_BATCH_MAX_MSGS  = 32     # max queued messages coalesced into one frame
+_BATCH_MAX_BYTES = 16 * 1024   # stop coalescing once a frame reaches this size
+_DISPATCH_WORKERS = 4     # concurrent request handlers per channel
+_STREAM_IDLE_TIMEOUT = 30   # seconds a streamed reply may go without a chunk
+_STREAM_MAX_QUEUED   = 64   # frames queued for the writer before a stream waits
+
+# Tunnel requests block for as long as the pod takes to answer (up to the
+# caller's 30s), so they get their own pool shared by all channels instead of
+# tying up the small per-channel one that serves detail/scale/logs calls.
+_PROXY_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=32, thread_name_prefix="proxy")
+
+
+# Queued by the keepalive thread; the writer sends an RFC 6455 ping for it.
+_PING = object()
+
+
+class StreamReply:
+    """
+    Returned by a request handler to stream its result: payload is sent as
+    the reply, then each bytes item of chunks as a stream/chunk push.
+    """
+    __slots__ = ("payload", "chunks")
+
+    def __init__(self, payload: dict, chunks):
+        self.payload = payload
+        self.chunks  = chunks
 
 
 class PeerChannel:
@@ -109,40 +265,126 @@ class PeerChannel:
     already-open server socket into the same channel object so both sides
     share the same message dispatch logic.
 
-    Thread-safety: _ws and _pending are guarded by _lock.
+    Thread-safety: _ws is guarded by _lock; _pending by _reply_cv. Sends never touch
+    the socket directly — they go on a per-connection queue drained by a
+    single writer thread, which also coalesces bursts into one frame.
     """
 
+    # One per peer and read on every send/recv; slots keep it dict-free.
+    __slots__ = (
+        "peer_name", "peer_url", "ws_url", "ca_pem", "peer_version_hash",
+        "binary", "peer_zlib", "connected_event",
+        "_ws", "_send_q", "_lock", "_pending", "_reply_cv", "_conn_gen",
+        "_running", "_handlers", "_streams", "_pools", "_ordered", "_serial",
+        "_serial_lock", "_recv_thread",
+        "_dispatch_pool", "_outbound", "_last_send_ts",
+    )
+
     def __init__(self, peer_name: str, peer_url: str, ca_pem: str = ""):
         self.peer_name = peer_name
         self.peer_url  = peer_url   # peer's public URL — WS connects here
+        # WS goes to the peer's public URL (nginx in production, UI NodePort in dev).
+        self.ws_url    = peer_url.replace("https://", "wss://").replace("http://", "ws://").rstrip("/") + "/ws"
         self.ca_pem    = ca_pem
         self.peer_version_hash: str = ""   # set when peer announces its version
         self._ws: websocket.WebSocket | None = None
+        # Writer queue for the live _ws. SimpleQueue is C-implemented: put()
+        # never blocks producers and costs about one lock-free append; a
+        # deque + threading.Semaphore pair measured ~10x slower because the
+        # Semaphore is pure Python.
+        self._send_q: queue.SimpleQueue | None = None
         self._lock     = threading.Lock()
-        self._pending: dict[str, dict] = {}   # id -> {"event": Event, "result": dict|None}
+        self._pending: dict[str, list] = {}   # id -> one-slot list, filled with the reply frame
+        self._reply_cv = threading.Condition()   # wakes call() waiters on reply or disconnect
+        self._conn_gen = 0   # bumped on every disconnect so waiters can bail early
         self._running  = True
-        self._handlers: dict[str, "callable"] = {}
+        # Built-in pushes go through the same table as registered handlers
+        self._handlers: dict[str, "callable"] = {
+            "ping":             lambda payload: None,   # keepalive from older peers
+            "version/announce": self._on_version_announce,
+            "stream/chunk":     self._on_stream_chunk,
+            "stream/end":       self._on_stream_end,
+        }
+        self._streams: dict[str, queue.SimpleQueue] = {}   # request id -> chunks for call_stream()
+        self._pools: dict[str, concurrent.futures.Executor] = {}   # msg type -> non-default request pool
+        # Mutating request types run one at a time per app id, in arrival
+        # order: a delete must not overtake the receive it follows.
+        self._ordered: set[str] = set()
+        self._serial: dict[str, collections.deque] = {}   # app id -> queued ordered requests
+        self._serial_lock = threading.Lock()
         self._recv_thread: threading.Thread | None = None
+        # Request handlers (k8s calls, proxying) run here so a slow one can't
+        # stall the recv loop — replies and pushes are still handled inline.
+        self._dispatch_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=_DISPATCH_WORKERS, thread_name_prefix=f"chan-{peer_name}")
         self.connected_event = threading.Event()   # set once the channel is ready to use
+        self.binary    = False   # True once both ends agreed on msgpack framing
+        self._outbound = False   # we dialled this connection (pings are ours to send)
+        self._last_send_ts = 0.0   # monotonic time of the last frame the writer sent
+        self.peer_zlib = False   # peer announced it can inflate compressed frames
 
     # ── Public API ────────────────────────────────────────────
 
-    def register(self, msg_type: str, handler):
-        """Register a handler for an incoming message type."""
+    def register(self, msg_type: str, handler, pool: concurrent.futures.Executor | None = None,
+                 ordered: bool = False):
+        """
+        Register a handler for an incoming message type. Requests of this type
+        run on pool if given, otherwise on the channel's own dispatch pool.
+
+        ordered=True is for handlers that mutate an app: requests of any
+        ordered type carrying the same payload "id" run one at a time, in the
+        order they arrived.
+        """
         self._handlers[msg_type] = handler
+        if pool is not None:
+            self._pools[msg_type] = pool
+        if ordered:
+            self._ordered.add(msg_type)
 
     def call(self, msg_type: str, payload: dict, timeout: float = 10.0) -> dict:
         """
         Send a request and block until the peer replies.
         Returns the reply payload dict, or raises RuntimeError on error/timeout.
         """
+        return self._call(uuid.uuid4().hex, msg_type, payload, timeout)
+
+    def call_stream(self, msg_type: str, payload: dict, timeout: float = 10.0):
+        """
+        Like call(), but lets the peer stream its result. Returns
+        (reply payload, chunk iterator); the iterator is None when the peer
+        replied in full (JSON channel, or a handler that doesn't stream).
+        timeout covers the reply; chunks may then take _STREAM_IDLE_TIMEOUT each.
+        """
+        if not self.binary:
+            return self.call(msg_type, payload, timeout), None
         req_id = uuid.uuid4().hex
-        event  = threading.Event()
-        self._pending[req_id] = {"event": event, "result": None}
-        self._send_raw({"id": req_id, "type": msg_type, "payload": payload})
-        fired = event.wait(timeout)
-        result = self._pending.pop(req_id, {}).get("result")
-        if not fired or result is None:
+        chunks = queue.SimpleQueue()
+        # Registered before sending: chunks can follow the reply immediately
+        self._streams[req_id] = chunks
+        try:
+            result = self._call(req_id, msg_type, {**payload, "stream": True}, timeout)
+        except Exception:
+            self._streams.pop(req_id, None)
+            raise
+        if not result.get("stream"):
+            self._streams.pop(req_id, None)
+            return result, None
+        return result, self._iter_stream(req_id, chunks)
+
+    def _call(self, req_id: str, msg_type: str, payload: dict, timeout: float) -> dict:
+        slot: list = []
+        with self._reply_cv:
+            gen = self._conn_gen
+            self._pending[req_id] = slot
+            try:
+                self._send_raw({"id": req_id, "type": msg_type, "payload": payload})
+            except Exception:
+                del self._pending[req_id]
+                raise
+            self._reply_cv.wait_for(lambda: slot or self._conn_gen != gen, timeout)
+            del self._pending[req_id]
+        result = slot[0] if slot else None
+        if result is None:
             raise RuntimeError(f"timeout waiting for reply to {msg_type}")
         if not result.get("ok"):
             raise RuntimeError(result.get("error", "peer error"))
@@ -156,42 +398,51 @@ class PeerChannel:
         """Gracefully shut down the channel."""
         self._running = False
         with self._lock:
+            if self._send_q is not None:
+                self._send_q.put(None)
+                self._send_q = None
             if self._ws:
                 try:
                     self._ws.close()
                 except Exception:
                     pass
                 self._ws = None
+        self._dispatch_pool.shutdown(wait=False, cancel_futures=True)
 
     def is_connected(self) -> bool:
         return self.connected_event.is_set()
 
     # ── Inbound (server side) ─────────────────────────────────
 
-    def attach_inbound(self, sock):
+    def attach_inbound(self, sock, codec: str = ""):
         """
         Called by the WS server handler (routes/ws.py) to hand off the
-        already-authenticated server socket. Runs the recv loop in the CALLING
-        thread (the flask-sock handler thread) — this is required because
-        simple_websocket does not support recv() from a different thread.
-        Blocks until the connection closes.
+        already-authenticated server socket. codec is the peer's
+        X-Channel-Codec header; "msgpack" switches our sends to binary frames.
+        Runs the recv loop in the CALLING thread (the flask-sock handler
+        thread) — this is required because simple_websocket does not support
+        recv() from a different thread. Blocks until the connection closes.
         """
-        # Store the socket using a private attribute that _send_raw can reach.
-        # We wrap it in a thin adapter so _send_raw / _ping_loop work unchanged.
+        # Wrap the socket in a thin adapter so the writer thread can drive it
+        # the same way as a websocket-client socket.
+        _tune_socket(getattr(sock, "sock", None))
+        adapter = _SimpleWsSendAdapter(sock)
         with self._lock:
-            self._ws = _SimpleWsSendAdapter(sock)
+            self._ws = adapter
+            self.binary = codec == _CODEC_MSGPACK
+            self.peer_zlib = False
+            self._send_q = send_q = queue.SimpleQueue()
+        threading.Thread(target=self._writer_loop, args=(adapter, send_q), daemon=True,
+                         name=f"ws-send-{self.peer_name}").start()
         self.connected_event.set()
 
         # Announce our version so the peer can detect mismatches
         try:
             from porpulsion import state as _state
-            self.push("version/announce", {"version": _state.VERSION_HASH})
+            self._send_encoded(_version_frame(_state.VERSION_HASH))
         except Exception:
             pass
 
-        # Start keepalive ping thread (same as outbound side)
-        threading.Thread(target=self._ping_loop, daemon=True).start()
-
         # Run the recv loop directly in this (handler) thread.
         self._inbound_recv_loop(sock)
 
@@ -224,21 +475,24 @@ class PeerChannel:
             # Connected — reset backoff and clear failure flag
             attempt = 0
             _notified_failure = False
+            up_since = time.monotonic()
             self._recv_loop()
 
             if not self._running:
                 return
+            # A connection that was healthy gets an immediate redial so callers
+            # aren't left without a channel. One the peer closed straight away
+            # (e.g. auth rejected) backs off like a failed connect.
+            if time.monotonic() - up_since >= _STABLE_AFTER:
+                log.info("Channel to %s dropped — reconnecting", self.peer_name)
+                continue
             delay = _RECONNECT_DELAY[min(attempt, len(_RECONNECT_DELAY) - 1)]
             log.info("Channel to %s dropped — reconnecting in %ds", self.peer_name, delay)
             attempt += 1
             time.sleep(delay)
 
     def _connect(self):
-        from porpulsion import tls, state
-
-        # WS goes to the peer's public URL (nginx in production, UI NodePort in dev).
-        ws_url = self.peer_url.replace("https://", "wss://").replace("http://", "ws://")
-        ws_url = ws_url.rstrip("/") + "/ws"
+        from porpulsion import state
 
         # For WSS connections nginx (or the LB) presents a real TLS cert — let
         # websocket-client verify it using the system CA bundle (certifi).
@@ -247,31 +501,37 @@ class PeerChannel:
 
         # Send our CA PEM base64-encoded — PEM contains newlines which would
         # break HTTP header framing if sent raw.
-        ca_b64 = base64.b64encode(state.AGENT_CA_PEM).decode()
+        ca_b64 = _ca_header(state.AGENT_CA_PEM)
         ws = websocket.WebSocket(sslopt=ssl_opts)
-        ws.connect(ws_url, timeout=_CONNECT_TIMEOUT, header={
+        ws.connect(self.ws_url, timeout=_CONNECT_TIMEOUT, header={
             "X-Agent-Name": state.AGENT_NAME,
             "X-Agent-Ca":   ca_b64,
+            _CODEC_HEADER:  _CODEC_MSGPACK,
         })
         # Reset timeout to None after handshake — the connect() timeout would
         # otherwise persist and cause recv() to raise WebSocketTimeoutException
         # after _CONNECT_TIMEOUT seconds of inactivity, dropping the channel.
         ws.settimeout(None)
+        _tune_socket(ws.sock)
         with self._lock:
             self._ws = ws
+            self.binary = False   # until the peer answers in msgpack
+            self.peer_zlib = False
+            self._outbound = True
+            self._last_send_ts = time.monotonic()
+            self._send_q = send_q = queue.SimpleQueue()
+        threading.Thread(target=self._writer_loop, args=(ws, send_q), daemon=True,
+                         name=f"ws-send-{self.peer_name}").start()
         self.connected_event.set()
         log.info("WebSocket channel connected to %s", self.peer_name)
 
         # Announce our version so the peer can detect mismatches
         try:
             from porpulsion import state as _state
-            self.push("version/announce", {"version": _state.VERSION_HASH})
+            self._send_encoded(_version_frame(_state.VERSION_HASH))
         except Exception:
             pass
 
-        # Start keepalive ping thread
-        threading.Thread(target=self._ping_loop, daemon=True).start()
-
     # ── Recv loop (server / inbound side) ────────────────────
 
     def _inbound_recv_loop(self, sock):
@@ -286,6 +546,7 @@ class PeerChannel:
         except ImportError:
             ConnectionClosed = Exception  # fallback if package layout changes
 
+        unpacker = _new_unpacker()
         while self._running:
             try:
                 raw = sock.receive()
@@ -297,28 +558,17 @@ class PeerChannel:
                     log.info("Inbound channel recv error from %s: %s", self.peer_name, exc)
                 break
 
-            if raw is None:
-                continue
-            if isinstance(raw, bytes):
-                raw = raw.decode("utf-8", errors="replace")
             if not raw:
                 continue
-            try:
-                msg = json.loads(raw)
-            except json.JSONDecodeError:
-                log.warning("Channel: bad JSON from %s", self.peer_name)
-                continue
-            self._dispatch(msg)
+            if not self._handle_frame(raw, unpacker):
+                unpacker = _new_unpacker()
 
-        with self._lock:
-            self._ws = None
-        self.connected_event.clear()
-        for entry in self._pending.values():
-            entry["event"].set()
+        self._drop_connection()
 
     # ── Recv loop (client / outbound side) ───────────────────
 
     def _recv_loop(self):
+        unpacker = _new_unpacker()
         while self._running:
             ws = self._ws
             if ws is None:
@@ -336,87 +586,337 @@ class PeerChannel:
                 # Empty frame — websocket-client returns "" on clean close
                 log.info("Channel to %s: empty recv (clean close)", self.peer_name)
                 break
+            if not self._handle_frame(raw, unpacker):
+                unpacker = _new_unpacker()
+
+        self._drop_connection()
+
+    def _handle_frame(self, raw, unpacker) -> bool:
+        """
+        Dispatch every message in one WS frame: bytes are one or more
+        concatenated msgpack messages fed through the connection's streaming
+        unpacker, str is a single JSON message. Returns False if the unpacker
+        was left in a bad state and must be replaced.
+        """
+        if isinstance(raw, str):
+            if raw in _LEGACY_PING_FRAMES:
+                return True
             try:
-                msg = json.loads(raw)
+                msg = _json_decode(raw)
             except json.JSONDecodeError:
                 log.warning("Channel: bad JSON from %s", self.peer_name)
-                continue
-
-            self._dispatch(msg)
+                return True
+            if isinstance(msg, dict):
+                self._dispatch(msg)
+            else:
+                log.warning("Channel: non-object frame from %s", self.peer_name)
+            return True
+
+        # Peer speaks msgpack — answer in kind from now on
+        self.binary = True
+        if raw[0] == _ZLIB_MAGIC:
+            # Bounded inflate: a tiny frame must not be able to expand into
+            # gigabytes of memory.
+            inflater = zlib.decompressobj()
+            try:
+                raw = inflater.decompress(raw, _MAX_INFLATED)
+            except zlib.error as exc:
+                log.warning("Channel: bad compressed frame from %s: %s", self.peer_name, exc)
+                return True
+            if inflater.unconsumed_tail:
+                log.warning("Channel: compressed frame from %s inflates past %d bytes — dropped",
+                            self.peer_name, _MAX_INFLATED)
+                return True
+            if not inflater.eof:
+                log.warning("Channel: truncated compressed frame from %s", self.peer_name)
+                return True
+        unpacker.feed(raw)
+        try:
+            for msg in unpacker:
+                if isinstance(msg, dict):
+                    self._dispatch(msg)
+                else:
+                    log.warning("Channel: non-object frame from %s", self.peer_name)
+            # Every frame holds whole messages. read_bytes raises ValueError
+            # while an object is half-read, i.e. the frame was truncated.
+            if unpacker.read_bytes(1):
+                raise ValueError("trailing bytes")
+        except Exception as exc:
+            log.warning("Channel: bad msgpack frame from %s: %s", self.peer_name, exc)
+            return False
+        return True
 
+    def _drop_connection(self):
+        """Forget the current socket, stop its writer and fail in-flight calls."""
         with self._lock:
             self._ws = None
+            if self._send_q is not None:
+                self._send_q.put(None)
+                self._send_q = None
         self.connected_event.clear()
         # Wake any callers blocked in call() so they get a timeout error
-        for entry in self._pending.values():
-            entry["event"].set()
+        with self._reply_cv:
+            self._conn_gen += 1
+            self._reply_cv.notify_all()
+        # Streams can't resume on a new connection — fail their readers
+        for req_id in list(self._streams):
+            chunks = self._streams.pop(req_id, None)
+            if chunks is not None:
+                chunks.put(RuntimeError(f"channel to {self.peer_name} closed mid-stream"))
 
     def _dispatch(self, msg: dict):
         msg_id   = msg.get("id")
         msg_type = msg.get("type", "")
-        payload  = msg.get("payload", {})
-
-        # Reply to one of our pending requests
-        if msg_id and msg_id in self._pending:
-            self._pending[msg_id]["result"] = msg
-            self._pending[msg_id]["event"].set()
-            return
 
-        # Incoming request — find a handler and send a reply
         if msg_id:
-            handler = self._handlers.get(msg_type)
-            if handler:
-                try:
-                    result = handler(payload)
-                    self._send_raw({"id": msg_id, "type": "reply",
-                                    "ok": True, "payload": result or {}})
-                except Exception as exc:
-                    log.warning("Handler %s raised: %s", msg_type, exc)
-                    self._send_raw({"id": msg_id, "type": "reply",
-                                    "ok": False, "error": str(exc), "payload": {}})
-            else:
-                self._send_raw({"id": msg_id, "type": "reply",
-                                "ok": False, "error": f"unknown type: {msg_type}",
-                                "payload": {}})
+            # Reply to one of our pending requests — one lookup, fill its slot
+            if msg_type == "reply":
+                with self._reply_cv:
+                    slot = self._pending.get(msg_id)
+                    if slot is not None:
+                        slot.append(msg)
+                        self._reply_cv.notify_all()
+                return
+            # Incoming request — handled on the dispatch pool, replies when done
+            payload = msg.get("payload", {})
+            if msg_type in self._ordered:
+                self._submit_ordered(str(payload.get("id", "")), msg_id, msg_type, payload)
+                return
+            try:
+                pool = self._pools.get(msg_type, self._dispatch_pool)
+                pool.submit(self._handle_request, msg_id, msg_type, payload)
+            except RuntimeError:
+                pass   # pool shut down — channel is closing
             return
 
         # Fire-and-forget push
-        if msg_type == "ping":
-            return
-        if msg_type == "version/announce":
-            peer_ver = payload.get("version", "")
-            self.peer_version_hash = peer_ver
-            if peer_ver:
-                from porpulsion import state as _state
-                if _state.VERSION_HASH and peer_ver != _state.VERSION_HASH:
-                    _emit_version_mismatch(self.peer_name, peer_ver)
-            return
         handler = self._handlers.get(msg_type)
         if handler:
             try:
-                handler(payload)
+                handler(msg.get("payload", {}))
             except Exception as exc:
                 log.warning("Push handler %s raised: %s", msg_type, exc)
 
-    def _send_raw(self, msg: dict):
-        with self._lock:
-            ws = self._ws
-        if ws is None:
-            raise RuntimeError(f"channel to {self.peer_name} is not connected")
+    def _submit_ordered(self, key: str, msg_id: str, msg_type: str, payload: dict):
+        """Queue an ordered request behind any still pending for the same app."""
+        with self._serial_lock:
+            pending = self._serial.get(key)
+            if pending is not None:
+                pending.append((msg_id, msg_type, payload))   # the running drain picks it up
+                return
+            self._serial[key] = collections.deque([(msg_id, msg_type, payload)])
         try:
-            ws.send(json.dumps(msg))
+            self._dispatch_pool.submit(self._drain_ordered, key)
+        except RuntimeError:
+            with self._serial_lock:   # pool shut down — channel is closing
+                self._serial.pop(key, None)
+
+    def _drain_ordered(self, key: str):
+        """Run one app's queued ordered requests in turn until none are left."""
+        while True:
+            with self._serial_lock:
+                pending = self._serial[key]
+                if not pending:
+                    del self._serial[key]
+                    return
+                msg_id, msg_type, payload = pending.popleft()
+            self._handle_request(msg_id, msg_type, payload)
+
+    def _on_stream_chunk(self, payload: dict):
+        chunks = self._streams.get(payload.get("id"))
+        if chunks is not None:
+            chunks.put(payload.get("data", b""))
+
+    def _on_stream_end(self, payload: dict):
+        chunks = self._streams.pop(payload.get("id"), None)
+        if chunks is not None:
+            error = payload.get("error")
+            chunks.put(RuntimeError(error) if error else None)
+
+    def _iter_stream(self, req_id: str, chunks: queue.SimpleQueue):
+        """Yield a streamed reply's chunks until stream/end; raise on error or stall."""
+        try:
+            while True:
+                try:
+                    item = chunks.get(timeout=_STREAM_IDLE_TIMEOUT)
+                except queue.Empty:
+                    raise RuntimeError("timeout waiting for stream data") from None
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            self._streams.pop(req_id, None)
+
+    def _send_stream(self, req_id: str, chunks):
+        """Push each chunk of a StreamReply, then stream/end (with any error)."""
+        error = ""
+        try:
+            for data in chunks:
+                self._send_raw({"type": "stream/chunk", "payload": {"id": req_id, "data": data}})
+                # Crude backpressure: don't let a big body pile up in the
+                # writer queue faster than the socket drains it.
+                send_q = self._send_q
+                while send_q is not None and send_q.qsize() > _STREAM_MAX_QUEUED:
+                    time.sleep(0.005)
+                    send_q = self._send_q
         except Exception as exc:
-            with self._lock:
-                self._ws = None
-            raise RuntimeError(f"channel send failed: {exc}") from exc
+            error = str(exc) or exc.__class__.__name__
+            log.warning("Channel to %s: stream for %s aborted: %s", self.peer_name, req_id, exc)
+        finally:
+            close = getattr(chunks, "close", None)
+            if close:
+                close()
+        try:
+            self._send_raw({"type": "stream/end", "payload": {"id": req_id, "error": error}})
+        except RuntimeError:
+            pass
 
-    def _ping_loop(self):
-        while self._running and self._ws is not None:
-            time.sleep(_PING_INTERVAL)
+    def _on_version_announce(self, payload: dict):
+        self.peer_zlib = "zlib" in (payload.get("features") or ())
+        peer_ver = payload.get("version", "")
+        self.peer_version_hash = peer_ver
+        if peer_ver:
+            from porpulsion import state as _state
+            if _state.VERSION_HASH and peer_ver != _state.VERSION_HASH:
+                _emit_version_mismatch(self.peer_name, peer_ver)
+
+    def _handle_request(self, msg_id: str, msg_type: str, payload: dict):
+        """Run the handler for an incoming request and send its reply."""
+        handler = self._handlers.get(msg_type)
+        stream = None
+        if handler:
             try:
-                self.push("ping", {})
-            except Exception:
-                break
+                result = handler(payload)
+                if isinstance(result, StreamReply):
+                    result, stream = result.payload, result.chunks
+                reply = {"id": msg_id, "type": "reply", "ok": True,
+                         "payload": result or {}}
+            except Exception as exc:
+                log.warning("Handler %s raised: %s", msg_type, exc)
+                reply = {"id": msg_id, "type": "reply",
+                         "ok": False, "error": str(exc), "payload": {}}
+        else:
+            reply = {"id": msg_id, "type": "reply",
+                     "ok": False, "error": f"unknown type: {msg_type}", "payload": {}}
+        try:
+            self._send_raw(reply)
+        except RuntimeError as exc:
+            log.debug("Channel to %s: could not reply to %s: %s",
+                      self.peer_name, msg_type, exc)
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+            return
+        if stream is not None:
+            self._send_stream(msg_id, stream)
+
+    def _send_raw(self, msg: dict):
+        # No lock on the hot path: _send_q (like _ws) is only ever swapped
+        # between None and an object by a single attribute store, which is
+        # atomic under the GIL. _lock only serialises the compound
+        # attach/teardown sequences.
+        send_q = self._send_q
+        if send_q is None:
+            raise RuntimeError(f"channel to {self.peer_name} is not connected")
+        send_q.put(msg)
+
+    def _send_encoded(self, frame: tuple[str, bytes]):
+        """Queue a frame pre-encoded by _preencode() — skips per-send encoding."""
+        self._send_raw(frame)
+
+    def _writer_loop(self, ws, send_q: queue.SimpleQueue):
+        """
+        Drain send_q onto ws until a None sentinel arrives. Items are message
+        dicts, _preencode() pairs, or _PING from the keepalive thread. On msgpack channels whatever has queued up
+        behind the first message (up to _BATCH_MAX_MSGS / _BATCH_MAX_BYTES) is
+        packed back to back into one binary frame; JSON peers get one frame per
+        message. A send failure closes ws so the recv loop tears down.
+        """
+        # One Packer per writer: it keeps its internal buffer between frames,
+        # where msgpack.packb() builds a fresh Packer on every call.
+        pack = msgpack.Packer(use_bin_type=True).pack
+        stop = False
+        while not stop:
+            msg = send_q.get()
+            if msg is None:
+                return
+            try:
+                if msg is _PING:
+                    ws.ping()
+                    self._last_send_ts = time.monotonic()
+                    continue
+                if not self.binary:
+                    ws.send(_as_json(msg))
+                    self._last_send_ts = time.monotonic()
+                    continue
+                frames = [_as_msgpack(msg, pack)]
+                size = len(frames[0])
+                while len(frames) < _BATCH_MAX_MSGS and size < _BATCH_MAX_BYTES:
+                    try:
+                        more = send_q.get_nowait()
+                    except queue.Empty:
+                        break
+                    if more is None:
+                        stop = True
+                        break
+                    frames.append(_as_msgpack(more, pack))
+                    size += len(frames[-1])
+                data = frames[0] if len(frames) == 1 else b"".join(frames)
+                if self.peer_zlib and len(data) >= _COMPRESS_MIN:
+                    packed = zlib.compress(data, _COMPRESS_LEVEL)
+                    # Already-compressed proxy bodies won't shrink — send as is
+                    if len(packed) < len(data) - len(data) // 8:
+                        data = packed
+                ws.send_binary(data)
+                self._last_send_ts = time.monotonic()
+            except Exception as exc:
+                log.info("Channel to %s: send failed: %s", self.peer_name, exc)
+                with self._lock:
+                    if self._ws is ws:
+                        self._ws = None
+                try:
+                    ws.close()
+                except Exception:
+                    pass
+                return
+
+
+# ── Keepalive ─────────────────────────────────────────────────
+#
+# One thread for all channels rather than a timer per writer. Only outbound
+# connections are pinged here — simple_websocket pings inbound ones itself
+# (SOCK_SERVER_OPTIONS on peer_app). A channel that sent anything within
+# PING_INTERVAL is left alone.
+
+_keepalive_lock = threading.Lock()
+_keepalive_thread: threading.Thread | None = None
+
+
+def _keepalive_loop():
+    from porpulsion import state
+    while True:
+        time.sleep(_KEEPALIVE_TICK)
+        now = time.monotonic()
+        for ch in list(state.peer_channels.values()):
+            send_q = ch._send_q
+            if send_q is None or not ch._outbound:
+                continue
+            if now - ch._last_send_ts >= PING_INTERVAL:
+                ch._last_send_ts = now   # don't queue another before this one goes out
+                send_q.put(_PING)
+
+
+def _ensure_keepalive():
+    global _keepalive_thread
+    if _keepalive_thread is not None:
+        return
+    with _keepalive_lock:
+        if _keepalive_thread is None:
+            _keepalive_thread = threading.Thread(target=_keepalive_loop, daemon=True,
+                                                 name="ws-keepalive")
+            _keepalive_thread.start()
 
 
 # ── Convenience helpers used by route handlers ────────────────
@@ -456,10 +956,11 @@ def open_channel_to(peer_name: str, peer_url: str, ca_pem: str = "") -> "PeerCha
     t = threading.Thread(target=ch.connect_and_maintain, daemon=True,
                          name=f"ws-chan-{peer_name}")
     t.start()
+    _ensure_keepalive()
     return ch
 
 
-def accept_channel(peer_name: str, sock) -> "PeerChannel":
+def accept_channel(peer_name: str, sock, codec: str = "") -> "PeerChannel":
     """
     Called by the WS server endpoint when a peer connects to us.
 
@@ -481,7 +982,7 @@ def accept_channel(peer_name: str, sock) -> "PeerChannel":
     ch = PeerChannel(peer_name, peer_url, ca_pem)
     _register_handlers(ch)
     state.peer_channels[peer_name] = ch
-    ch.attach_inbound(sock)   # blocks until the connection closes
+    ch.attach_inbound(sock, codec)   # blocks until the connection closes
     return ch
 
 
@@ -498,15 +999,16 @@ def _register_handlers(ch: "PeerChannel"):
         handle_proxy_request,
         handle_peer_disconnect,
     )
-    ch.register("remoteapp/receive",     handle_remoteapp_receive)
+    # Mutating requests stay in arrival order per app; reads run concurrently.
+    ch.register("remoteapp/receive",     handle_remoteapp_receive,     ordered=True)
     ch.register("remoteapp/status",      handle_remoteapp_status)
-    ch.register("remoteapp/delete",      handle_remoteapp_delete)
-    ch.register("remoteapp/scale",       handle_remoteapp_scale)
+    ch.register("remoteapp/delete",      handle_remoteapp_delete,      ordered=True)
+    ch.register("remoteapp/scale",       handle_remoteapp_scale,       ordered=True)
     ch.register("remoteapp/detail",      handle_remoteapp_detail)
     ch.register("remoteapp/logs",        handle_remoteapp_logs)
-    ch.register("remoteapp/spec-update", handle_remoteapp_spec_update)
+    ch.register("remoteapp/spec-update", handle_remoteapp_spec_update, ordered=True)
     # Wrap proxy handler so it can enforce the per-peer tunnel allowlist.
     def _proxy_handler(payload, _peer=ch.peer_name):
         return handle_proxy_request(payload, peer_name=_peer)
-    ch.register("proxy/request", _proxy_handler)
+    ch.register("proxy/request", _proxy_handler, pool=_PROXY_POOL)
     ch.register("peer/disconnect",       handle_peer_disconnect)
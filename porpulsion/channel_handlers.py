@@ -7,24 +7,68 @@ Handlers for push-type messages return None.
 
 All inbound peer authentication has already been done by the WS endpoint
 before the socket is handed to the channel — these handlers trust the caller.
+
+This module is only imported from channel._register_handlers(), after the
+agent has started, so its dependencies are bound once at module level rather
+than re-imported on every frame.
 """
-import base64
+import binascii
 import logging
+import secrets
+import threading
+import time
 from datetime import datetime, timezone
 
+from porpulsion import state, tls
+from porpulsion.channel import StreamReply
+from porpulsion.k8s.executor import (
+    delete_workload, get_deployment_status, get_pod_logs, run_workload, scale_workload,
+)
+from porpulsion.k8s.tunnel import proxy_request
+from porpulsion.models import RemoteApp, RemoteAppSpec
+from porpulsion.notifications import add_notification
+from porpulsion.routes.workloads import _check_resource_quota
+from porpulsion.settings_lists import split_csv_set
+
 log = logging.getLogger("porpulsion.channel_handlers")
 
 
+# Status pushes only mark state dirty; a single flusher thread writes the
+# ConfigMap at most once per _STATE_FLUSH_DELAY, so a burst of updates costs
+# one k8s write instead of one per frame.
+_STATE_FLUSH_DELAY = 2.0
+_state_dirty = threading.Event()
+_flusher_lock = threading.Lock()
+_flusher: threading.Thread | None = None
+
+
+def _state_flusher():
+    while True:
+        _state_dirty.wait()
+        time.sleep(_STATE_FLUSH_DELAY)
+        _state_dirty.clear()
+        try:
+            tls.save_state_configmap(state.NAMESPACE, state.local_apps, state.settings,
+                                     state.pending_approval)
+        except Exception as exc:
+            log.warning("Failed to persist state after status updates: %s", exc)
+
+
+def _mark_state_dirty():
+    global _flusher
+    if _flusher is None:
+        with _flusher_lock:
+            if _flusher is None:
+                _flusher = threading.Thread(target=_state_flusher, daemon=True,
+                                            name="state-flush")
+                _flusher.start()
+    _state_dirty.set()
+
+
 # ── RemoteApp ─────────────────────────────────────────────────
 
 def handle_remoteapp_receive(payload: dict) -> dict:
     """Accept a RemoteApp submission from a peer."""
-    from porpulsion import state, tls
-    from porpulsion.models import RemoteApp, RemoteAppSpec
-    from porpulsion.routes.workloads import _check_resource_quota
-
-    from porpulsion.notifications import add_notification
-
     if not state.settings.allow_inbound_remoteapps:
         raise RuntimeError("inbound workloads are disabled on this agent")
 
@@ -39,7 +83,7 @@ def handle_remoteapp_receive(payload: dict) -> dict:
         )
         raise RuntimeError(quota_err)
 
-    app_id = payload.get("id") or __import__("uuid").uuid4().hex[:8]
+    app_id = payload.get("id") or secrets.token_hex(4)
     source = state.peers.get(source_peer)
 
     if state.settings.require_remoteapp_approval:
@@ -69,7 +113,6 @@ def handle_remoteapp_receive(payload: dict) -> dict:
     state.remote_apps[ra.id] = ra
     log.info("Received app %s (%s) via channel from %s", ra.name, ra.id, source_peer)
 
-    from porpulsion.k8s.executor import run_workload
     # Pass the peer name as callback_url — executor will route via channel
     run_workload(ra, source_peer, peer=source)
     return ra.to_dict()
@@ -77,8 +120,6 @@ def handle_remoteapp_receive(payload: dict) -> dict:
 
 def handle_remoteapp_status(payload: dict):
     """Status update pushed from executor back to the submitting peer."""
-    from porpulsion import state, tls
-    from porpulsion.notifications import add_notification
     app_id = payload.get("id") or payload.get("app_id", "")
     status = payload.get("status", "")
     updated_at = payload.get("updated_at", datetime.now(timezone.utc).isoformat())
@@ -88,7 +129,7 @@ def handle_remoteapp_status(payload: dict):
         ra.status = status
         ra.updated_at = updated_at
         log.info("Status update for %s: %s (via channel)", app_id, status)
-        tls.save_state_configmap(state.NAMESPACE, state.local_apps, state.settings)
+        _mark_state_dirty()
         if status.startswith("Failed") or status == "Timeout":
             add_notification(
                 level="error",
@@ -99,8 +140,6 @@ def handle_remoteapp_status(payload: dict):
 
 def handle_remoteapp_delete(payload: dict) -> dict:
     """Delete a RemoteApp on this (executing) side."""
-    from porpulsion import state
-    from porpulsion.k8s.executor import delete_workload
     app_id = payload.get("id", "")
     if app_id in state.remote_apps:
         ra = state.remote_apps[app_id]
@@ -114,8 +153,6 @@ def handle_remoteapp_delete(payload: dict) -> dict:
 
 def handle_remoteapp_scale(payload: dict) -> dict:
     """Scale a RemoteApp on this (executing) side."""
-    from porpulsion import state
-    from porpulsion.k8s.executor import scale_workload
     app_id   = payload.get("id", "")
     replicas = payload.get("replicas")
     if app_id not in state.remote_apps:
@@ -127,8 +164,6 @@ def handle_remoteapp_scale(payload: dict) -> dict:
 
 def handle_remoteapp_detail(payload: dict) -> dict:
     """Return k8s deployment detail for a RemoteApp."""
-    from porpulsion import state
-    from porpulsion.k8s.executor import get_deployment_status
     app_id = payload.get("id", "")
     if app_id not in state.remote_apps:
         raise RuntimeError("app not found")
@@ -140,8 +175,6 @@ def handle_remoteapp_detail(payload: dict) -> dict:
 
 def handle_remoteapp_logs(payload: dict) -> dict:
     """Return pod logs for a RemoteApp (executing on this cluster)."""
-    from porpulsion import state
-    from porpulsion.k8s.executor import get_pod_logs
     app_id = payload.get("id", "")
     if app_id not in state.remote_apps:
         raise RuntimeError("app not found")
@@ -153,10 +186,6 @@ def handle_remoteapp_logs(payload: dict) -> dict:
 
 def handle_remoteapp_spec_update(payload: dict) -> dict:
     """Apply a new spec to a RemoteApp on the executing side."""
-    from porpulsion import state
-    from porpulsion.models import RemoteAppSpec
-    from porpulsion.routes.workloads import _check_resource_quota
-    from porpulsion.k8s.executor import run_workload
     app_id   = payload.get("id", "")
     new_spec = payload.get("spec")
     if app_id not in state.remote_apps:
@@ -177,25 +206,26 @@ def handle_remoteapp_spec_update(payload: dict) -> dict:
 def handle_proxy_request(payload: dict, peer_name: str = "") -> dict:
     """
     Proxy an HTTP request to a local pod and return the response.
-    Body is base64-encoded in the payload.
+    Body is raw bytes on msgpack channels, base64 text on JSON channels;
+    the response body is returned in the same form the request used. When
+    the requester asked for a stream the body follows the reply as chunks.
     """
-    from porpulsion import state
-    from porpulsion.k8s.tunnel import proxy_request
-
     app_id  = payload.get("app_id", "")
     port    = int(payload.get("port", 80))
     method  = payload.get("method", "GET")
     path    = payload.get("path", "")
     headers = payload.get("headers", {})
-    body    = base64.b64decode(payload.get("body", ""))
+    body    = payload.get("body", b"")
+    binary  = isinstance(body, bytes)
+    if not binary:
+        body = binascii.a2b_base64(body)
 
     if not state.settings.allow_inbound_tunnels:
         raise RuntimeError("inbound tunnels are disabled on this agent")
 
     # Enforce per-peer tunnel allowlist. Empty string = allow all.
-    allowed_raw = (state.settings.allowed_tunnel_peers or "").strip()
-    if allowed_raw:
-        allowed_tokens = {t.strip() for t in allowed_raw.split(",") if t.strip()}
+    allowed_tokens = split_csv_set(state.settings.allowed_tunnel_peers or "")
+    if allowed_tokens:
         # Tokens are either "peer" (allow all apps from that peer) or "peer/app_id"
         if peer_name not in allowed_tokens and f"{peer_name}/{app_id}" not in allowed_tokens:
             raise RuntimeError(f"tunnel from peer '{peer_name}' is not permitted")
@@ -203,15 +233,24 @@ def handle_proxy_request(payload: dict, peer_name: str = "") -> dict:
     if app_id not in state.remote_apps:
         raise RuntimeError("app not found")
 
-    status, resp_headers, resp_body = proxy_request(
+    status, resp_headers, chunks = proxy_request(
         remote_app_id=app_id, port=port,
         method=method, path=path,
         headers=headers, body=body,
     )
+    if binary and payload.get("stream"):
+        return StreamReply(
+            {"status": status, "headers": dict(resp_headers), "stream": True},
+            chunks,
+        )
+    try:
+        resp_body = b"".join(chunks)
+    finally:
+        chunks.close()
     return {
         "status": status,
         "headers": dict(resp_headers),
-        "body": base64.b64encode(resp_body).decode(),
+        "body": resp_body if binary else binascii.b2a_base64(resp_body, newline=False).decode(),
     }
 
 
@@ -219,8 +258,6 @@ def handle_proxy_request(payload: dict, peer_name: str = "") -> dict:
 
 def handle_peer_disconnect(payload: dict):
     """Peer is telling us it's disconnecting cleanly."""
-    from porpulsion import state, tls
-    from porpulsion.notifications import add_notification
     peer_name = payload.get("name", "")
     if peer_name and peer_name in state.peers:
         state.peers.pop(peer_name)
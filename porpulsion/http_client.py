@@ -0,0 +1,20 @@
+"""
+Shared outbound HTTP session for the peering handshake.
+
+Both sides of the handshake POST to the other agent's /peer endpoint before
+any CA is pinned, so these calls skip certificate verification. Using one
+process-wide session lets successive calls to the same peer (invite
+retries, then the operator's accept) reuse a kept-alive connection instead
+of a fresh TCP + TLS handshake each time. Everything after the handshake
+goes over the mTLS-pinned WebSocket channel, not this session.
+"""
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+BOOTSTRAP_SESSION = requests.Session()
+BOOTSTRAP_SESSION.verify = False   # bootstrap-only: no CA to verify yet
+BOOTSTRAP_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=4))
+BOOTSTRAP_SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=4))
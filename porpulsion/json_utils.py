@@ -0,0 +1,52 @@
+"""
+Fast JSON for the Flask apps.
+
+OrjsonProvider plugs orjson into Flask's JSON provider hook so jsonify()
+and request.get_json() use it. orjson is optional: without it (or for a
+value orjson can't encode) the stdlib-backed default provider is used.
+Output is equivalent either way — compact, sorted keys — except that
+orjson writes non-ASCII text as raw UTF-8 rather than escaping it.
+"""
+import json
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """DefaultJSONProvider that serialises with orjson when it can."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is not None:
+            option = orjson.OPT_NON_STR_KEYS
+            if kwargs.get("sort_keys", self.sort_keys):
+                option |= orjson.OPT_SORT_KEYS
+            if kwargs.get("indent"):
+                option |= orjson.OPT_INDENT_2
+            try:
+                return orjson.dumps(obj, option=option).decode()
+            except TypeError:
+                pass    # e.g. a type only the default provider's hook knows
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Compact, sorted-key JSON as bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, separators=(",", ":"), sort_keys=True).encode()
+
+
+def install(app) -> None:
+    """Serve and parse JSON for `app` through OrjsonProvider."""
+    app.json = OrjsonProvider(app)
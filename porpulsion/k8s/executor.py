@@ -1,9 +1,12 @@
+import concurrent.futures
 import logging
 import os
+import random
+import re
 import threading
 import time
 from datetime import datetime, timezone
-from kubernetes import client, config
+from kubernetes import client, config, watch
 
 log = logging.getLogger("porpulsion.executor")
 
@@ -14,14 +17,56 @@ except config.ConfigException:
     log.warning("Not running in-cluster, falling back to default kubeconfig")
     config.load_kube_config()
 
-apps_v1 = client.AppsV1Api()
-core_v1 = client.CoreV1Api()
+# One ApiClient (one urllib3 pool) for every apiserver call in the agent.
+# The default pool of 4 is far too small once deploy watchers, the Service
+# watch and status/proxy lookups run concurrently.
+_k8s_config = client.Configuration.get_default_copy()
+_k8s_config.connection_pool_maxsize = 64
+api_client = client.ApiClient(_k8s_config)
+
+apps_v1 = client.AppsV1Api(api_client)
+core_v1 = client.CoreV1Api(api_client)
 
 NAMESPACE = os.environ.get("PORPULSION_NAMESPACE", "porpulsion")
 
-# Tracks the active polling thread stop-event per app id so re-deploys
-# cancel the old watcher before starting a new one.
+# Deploys (applying the Deployment + Service) run on a bounded shared pool
+# rather than a thread per app; a burst beyond this many simply queues.
+# Waiting for readiness does not hold a worker — see _watch_ready.
+_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=int(os.environ.get("PORPULSION_MAX_WORKERS", "32")),
+    thread_name_prefix="workload",
+)
+
+# Tracks the active deploy's stop-event (and its pool future) per app id so a
+# re-deploy cancels the old one's readiness tracking before starting its own.
+# Guarded by _stop_events_lock: concurrent re-deploys must not both miss
+# the other's event.
 _stop_events: dict[str, threading.Event] = {}
+_deploy_futures: dict[str, concurrent.futures.Future] = {}
+_stop_events_lock = threading.Lock()
+
+# How long a new Deployment gets to become Ready before we report Timeout,
+# and the longest single watch request. Watches are re-opened in slices so
+# deadlines, re-deploys and newly registered apps are noticed even when the
+# Deployments are quiet.
+_READY_TIMEOUT = 120
+_READY_WATCH_SLICE = 10
+
+# Apps waiting to turn Ready, shared by one watcher thread:
+# app id -> (remote_app, callback_url, peer, replicas, deadline, stop)
+_ready_waiting: dict[str, tuple] = {}
+_ready_lock = threading.Lock()
+_ready_wakeup = threading.Event()   # set when an app is registered
+_ready_thread: threading.Thread | None = None
+
+# Status push retry backoff (decorrelated jitter): base/cap per sleep, and an
+# overall budget so a dead peer can't hold a reporter thread for long.
+_REPORT_BACKOFF_BASE = 0.5
+_REPORT_BACKOFF_CAP = 30.0
+_REPORT_RETRY_BUDGET = 60.0
+
+# Leading RFC 3339 timestamp on a pod log line (read_namespaced_pod_log timestamps=True)
+_LOG_TS_RE = re.compile(r"^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?Z)\s*(.*)$")
 
 
 
@@ -35,32 +80,134 @@ def _report_status(remote_app, callback_url, status, peer=None, retries=3):
     log.info("App %s (%s) -> %s", remote_app.name, remote_app.id, status)
     if not callback_url:
         return
+    if status == remote_app.last_reported_status:
+        # The peer already has this status (e.g. a re-deploy of an app that
+        # is still Creating); nothing new to tell it.
+        return
     payload = {"id": remote_app.id, "status": status, "updated_at": remote_app.updated_at}
+    # Jittered so agents reporting to a peer that just came back don't all
+    # retry in lock-step.
+    deadline = time.monotonic() + _REPORT_RETRY_BUDGET
+    sleep = _REPORT_BACKOFF_BASE
     for attempt in range(retries):
         try:
             from porpulsion.channel import get_channel
             get_channel(callback_url).push("remoteapp/status", payload)
+            remote_app.last_reported_status = status
             return
         except Exception as e:
             log.warning("Failed to push status to %s (attempt %d): %s", callback_url, attempt + 1, e)
         if attempt < retries - 1:
-            time.sleep(2 ** attempt)
+            sleep = min(_REPORT_BACKOFF_CAP, random.uniform(_REPORT_BACKOFF_BASE, sleep * 3))
+            if time.monotonic() + sleep > deadline:
+                return
+            time.sleep(sleep)
+
+
+def _track_ready(remote_app, callback_url, peer, replicas, stop) -> None:
+    """Hand a freshly applied Deployment to the readiness watcher."""
+    global _ready_thread
+    with _ready_lock:
+        if stop.is_set():
+            return   # re-deployed while we were applying
+        _ready_waiting[remote_app.id] = (remote_app, callback_url, peer, replicas,
+                                         time.monotonic() + _READY_TIMEOUT, stop)
+        if _ready_thread is None:
+            _ready_thread = threading.Thread(target=_watch_ready, daemon=True,
+                                             name="ready-watch")
+            _ready_thread.start()
+    _ready_wakeup.set()
+
+
+def _finish_ready(app_id: str, entry: tuple, result: str) -> None:
+    """Drop entry from the watcher and report result, unless it was re-deployed."""
+    with _ready_lock:
+        if _ready_waiting.get(app_id) is not entry:
+            return   # already finished, or replaced by a re-deploy
+        del _ready_waiting[app_id]
+    remote_app, callback_url, peer, _, _, stop = entry
+    if stop.is_set():
+        return
+    with _stop_events_lock:
+        # Only clear our own entry; a re-deploy may have replaced it
+        if _stop_events.get(app_id) is stop:
+            del _stop_events[app_id]
+            _deploy_futures.pop(app_id, None)
+    fut = _EXECUTOR.submit(_report_status, remote_app, callback_url, result, peer=peer)
+    fut.add_done_callback(_log_deploy_error)
+
+
+def _watch_ready() -> None:
+    """
+    Single watcher for every deployed RemoteApp that isn't Ready yet.
+
+    Streams the labelled Deployments in slices of at most _READY_WATCH_SLICE
+    seconds. Each slice starts without a resourceVersion, so the apiserver
+    replays current state first and an app registered mid-slice is picked up
+    by the next one. Apps still waiting at their deadline report Timeout;
+    re-deployed apps (stop set) are dropped silently.
+    """
+    while True:
+        with _ready_lock:
+            waiting = dict(_ready_waiting)
+        if not waiting:
+            _ready_wakeup.wait()
+            _ready_wakeup.clear()
+            continue
+        now = time.monotonic()
+        for app_id, entry in waiting.items():
+            if entry[5].is_set():
+                with _ready_lock:
+                    if _ready_waiting.get(app_id) is entry:
+                        del _ready_waiting[app_id]
+            elif entry[4] <= now:
+                _finish_ready(app_id, entry, "Timeout")
+        next_deadline = min(e[4] for e in waiting.values())
+        w = watch.Watch()
+        try:
+            for event in w.stream(apps_v1.list_namespaced_deployment, NAMESPACE,
+                                  label_selector="porpulsion.io/remote-app-id",
+                                  timeout_seconds=max(1, min(_READY_WATCH_SLICE,
+                                                             int(next_deadline - now) + 1))):
+                d = event["object"]
+                app_id = (d.metadata.labels or {}).get("porpulsion.io/remote-app-id", "")
+                with _ready_lock:
+                    entry = _ready_waiting.get(app_id)
+                if entry and event["type"] != "DELETED" and (d.status.ready_replicas or 0) >= entry[3]:
+                    _finish_ready(app_id, entry, "Ready")
+        except Exception as e:
+            log.warning("Readiness watch failed: %s", getattr(e, "reason", e))
+            time.sleep(2)
+
+
+def _log_deploy_error(fut: concurrent.futures.Future) -> None:
+    # Pool tasks swallow exceptions that a bare thread would have printed
+    if fut.cancelled():
+        return
+    exc = fut.exception()
+    if exc is not None:
+        log.error("Deploy task failed: %s", exc, exc_info=exc)
 
 
 def run_workload(remote_app, callback_url, peer=None):
     """Create a real Kubernetes Deployment for the RemoteApp."""
     # Cancel any existing watcher for this app before starting a new one
-    existing = _stop_events.get(remote_app.id)
-    if existing:
-        existing.set()
     stop = threading.Event()
-    _stop_events[remote_app.id] = stop
+    with _stop_events_lock:
+        existing = _stop_events.get(remote_app.id)
+        if existing:
+            existing.set()
+            # Still queued behind other deploys: drop it outright
+            old_fut = _deploy_futures.get(remote_app.id)
+            if old_fut:
+                old_fut.cancel()
+        _stop_events[remote_app.id] = stop
 
     def _execute():
         spec     = remote_app.spec
         image    = spec.image
         replicas = spec.replicas
-        deploy_name = f"ra-{remote_app.id}-{remote_app.name}"[:63]
+        deploy_name = remote_app.deploy_name
 
         # ── resources ────────────────────────────────────────
         resource_requirements = None
@@ -277,31 +424,20 @@ def run_workload(remote_app, callback_url, peer=None):
 
         _report_status(remote_app, callback_url, "Running", peer=peer)
 
-        for _ in range(60):
-            if stop.is_set():
-                log.info("Watcher for %s cancelled (re-deploy)", remote_app.id)
-                return
-            time.sleep(2)
-            try:
-                dep = apps_v1.read_namespaced_deployment_status(deploy_name, NAMESPACE)
-                ready = dep.status.ready_replicas or 0
-                if ready >= replicas:
-                    _report_status(remote_app, callback_url, "Ready", peer=peer)
-                    _stop_events.pop(remote_app.id, None)
-                    return
-            except client.ApiException as e:
-                log.warning("Error checking deployment status: %s", e.reason)
-
-        _report_status(remote_app, callback_url, "Timeout", peer=peer)
-        _stop_events.pop(remote_app.id, None)
+        # Readiness is tracked by the shared watcher, so this pool worker is
+        # free for the next deploy as soon as the objects are applied.
+        _track_ready(remote_app, callback_url, peer, replicas, stop)
 
-    t = threading.Thread(target=_execute, daemon=True)
-    t.start()
+    fut = _EXECUTOR.submit(_execute)
+    fut.add_done_callback(_log_deploy_error)
+    with _stop_events_lock:
+        if _stop_events.get(remote_app.id) is stop:
+            _deploy_futures[remote_app.id] = fut
 
 
 def delete_workload(remote_app) -> None:
     """Delete the Kubernetes Deployment and Service for a RemoteApp."""
-    deploy_name = f"ra-{remote_app.id}-{remote_app.name}"[:63]
+    deploy_name = remote_app.deploy_name
     try:
         apps_v1.delete_namespaced_deployment(
             name=deploy_name,
@@ -326,7 +462,7 @@ def delete_workload(remote_app) -> None:
 
 def scale_workload(remote_app, replicas: int) -> None:
     """Scale a RemoteApp deployment to the given replica count."""
-    deploy_name = f"ra-{remote_app.id}-{remote_app.name}"[:63]
+    deploy_name = remote_app.deploy_name
     try:
         dep = apps_v1.read_namespaced_deployment(deploy_name, NAMESPACE)
         dep.spec.replicas = replicas
@@ -339,7 +475,7 @@ def scale_workload(remote_app, replicas: int) -> None:
 
 def get_deployment_status(remote_app) -> dict:
     """Return live k8s status info for a RemoteApp deployment."""
-    deploy_name = f"ra-{remote_app.id}-{remote_app.name}"[:63]
+    deploy_name = remote_app.deploy_name
     try:
         dep = apps_v1.read_namespaced_deployment_status(deploy_name, NAMESPACE)
         pods = core_v1.list_namespaced_pod(
@@ -376,22 +512,19 @@ def get_pod_logs(remote_app, tail: int = 200, pod_name: str | None = None, order
     If order_by_time is True, fetch with timestamps and return lines sorted by time (single tail).
     Returns {"lines": [{"pod": str, "message": str, "ts": str|None}, ...]} or {"error": str}.
     """
-    import re
-    from datetime import datetime, timezone
-
     try:
-        pods = core_v1.list_namespaced_pod(
-            NAMESPACE,
-            label_selector=f"porpulsion.io/remote-app-id={remote_app.id}",
-        )
+        # For a known pod, let the apiserver filter by name rather than listing
+        # every pod of the app. The label selector stays so callers can only
+        # ever read pods belonging to this RemoteApp.
+        kwargs = {"label_selector": f"porpulsion.io/remote-app-id={remote_app.id}"}
         if pod_name:
-            pods.items = [p for p in pods.items if p.metadata.name == pod_name]
+            kwargs["field_selector"] = f"metadata.name={pod_name}"
+        pods = core_v1.list_namespaced_pod(NAMESPACE, **kwargs)
         if not pods.items:
             return {"lines": [], "error": "no pods found" if pod_name else "no pods found"}
 
         lines: list[dict] = []
         per_pod_tail = max(50, tail // len(pods.items)) if len(pods.items) > 1 else tail
-        ts_re = re.compile(r"^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?Z)\s*(.*)$")
 
         for p in pods.items:
             name = p.metadata.name
@@ -412,7 +545,7 @@ def get_pod_logs(remote_app, tail: int = 200, pod_name: str | None = None, order
                 ts_val = None
                 msg = line
                 if order_by_time:
-                    m = ts_re.match(line)
+                    m = _LOG_TS_RE.match(line)
                     if m:
                         ts_val = m.group(1)
                         msg = m.group(2) or ""
@@ -8,21 +8,129 @@ the RemoteApp's Service (load-balanced across pods), then stream the response ba
 Scope enforcement: Service is resolved from k8s at call time using the
 porpulsion.io/remote-app-id label, so the caller never supplies a target address.
 """
+import http.cookiejar
 import logging
+import threading
+import time
+from typing import Iterator
+
+import requests
+from requests.adapters import HTTPAdapter
 
 log = logging.getLogger("porpulsion.tunnel")
 
 import os
 NAMESPACE = os.environ.get("PORPULSION_NAMESPACE", "porpulsion")
 
+# Shared keep-alive session for upstream Service calls, so successive proxied
+# requests to the same app reuse a pooled connection instead of opening a new
+# socket each time. pool_maxsize matches the channel's proxy worker pool.
+# Only the connection pool is shared: the cookie jar accepts nothing, so a
+# Set-Cookie from one upstream response is never replayed on another
+# tunnel user's request (Set-Cookie is still passed back to the caller).
+_PROXY_SESSION = requests.Session()
+_PROXY_SESSION.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+_PROXY_SESSION.mount("http://", HTTPAdapter(pool_connections=64, pool_maxsize=32))
+
+# Hop-by-hop headers that must not be forwarded (either direction)
+_SKIP = frozenset({"host", "transfer-encoding", "connection", "keep-alive",
+                   "proxy-authenticate", "proxy-authorization", "te", "trailers", "upgrade"})
+
+# remote_app_id -> (expires_at, host). Saves an apiserver list per proxied
+# request; entries are dropped early when a request to the host fails.
+_RESOLVE_TTL = 5.0
+_resolve_cache: dict[str, tuple[float, str]] = {}
+_resolve_lock = threading.Lock()
+
+
+# remote_app_id -> host, kept current by a Service watch (see
+# _watch_services). Lookups fall back to listing when an app is missing,
+# e.g. its Service was created after the last event we saw.
+_svc_hosts: dict[str, str] = {}
+_svc_watch_thread: threading.Thread | None = None
+_svc_watch_lock = threading.Lock()
+_APP_LABEL = "porpulsion.io/remote-app-id"
+_SVC_WATCH_BACKOFF_MAX = 300.0   # cap on the retry delay after watch failures
+
 
 def _k8s_core_v1():
-    from kubernetes import client, config as kube_config
-    try:
-        kube_config.load_incluster_config()
-    except Exception:
-        kube_config.load_kube_config()
-    return client.CoreV1Api()
+    """The executor's shared CoreV1Api (imported lazily; it loads kube config)."""
+    from porpulsion.k8s.executor import core_v1
+    return core_v1
+
+
+def _watch_services():
+    """
+    Mirror the labelled Services in NAMESPACE into _svc_hosts.
+
+    Lists once, then streams changes from the list's resourceVersion; on a
+    410 the index is rebuilt from a fresh list. Other failures empty the
+    index (so lookups fall back to direct lists rather than stale hosts) and
+    retry with exponential backoff. A 401/403 means RBAC doesn't allow the
+    watch: the thread gives up and resolve_service_host keeps using direct
+    lookups.
+    """
+    from kubernetes import watch as _k8s_watch
+    from kubernetes.client import ApiException
+
+    resource_version = None
+    backoff = 1.0
+    while True:
+        try:
+            core_v1 = _k8s_core_v1()
+            if resource_version is None:
+                svcs = core_v1.list_namespaced_service(NAMESPACE, label_selector=_APP_LABEL)
+                fresh = {}
+                for svc in svcs.items:
+                    app_id = (svc.metadata.labels or {}).get(_APP_LABEL)
+                    if app_id:
+                        fresh[app_id] = f"{svc.metadata.name}.{NAMESPACE}.svc.cluster.local"
+                _svc_hosts.clear()
+                _svc_hosts.update(fresh)
+                resource_version = svcs.metadata.resource_version
+                backoff = 1.0
+            w = _k8s_watch.Watch()
+            for event in w.stream(core_v1.list_namespaced_service, NAMESPACE,
+                                  label_selector=_APP_LABEL,
+                                  resource_version=resource_version,
+                                  timeout_seconds=300):
+                svc = event["object"]
+                resource_version = svc.metadata.resource_version
+                app_id = (svc.metadata.labels or {}).get(_APP_LABEL)
+                if not app_id:
+                    continue
+                if event["type"] == "DELETED":
+                    _svc_hosts.pop(app_id, None)
+                else:
+                    _svc_hosts[app_id] = f"{svc.metadata.name}.{NAMESPACE}.svc.cluster.local"
+            continue   # watch timed out normally — resume from resource_version
+        except ApiException as exc:
+            resource_version = None
+            if exc.status == 410:
+                continue
+            _svc_hosts.clear()
+            if exc.status in (401, 403):
+                log.warning("Service watch not permitted (%s) — resolving Services "
+                            "by direct lookup", exc.reason)
+                return
+            log.warning("Service watch failed: %s — retrying in %.0fs", exc.reason, backoff)
+        except Exception as exc:
+            resource_version = None
+            _svc_hosts.clear()
+            log.warning("Service watch failed: %s — retrying in %.0fs", exc, backoff)
+        time.sleep(backoff)
+        backoff = min(backoff * 2, _SVC_WATCH_BACKOFF_MAX)
+
+
+def _ensure_service_watch():
+    global _svc_watch_thread
+    if _svc_watch_thread is not None:
+        return
+    with _svc_watch_lock:
+        if _svc_watch_thread is None:
+            _svc_watch_thread = threading.Thread(target=_watch_services, daemon=True,
+                                                 name="svc-watch")
+            _svc_watch_thread.start()
 
 
 def resolve_service_host(remote_app_id: str) -> str:
@@ -30,51 +138,99 @@ def resolve_service_host(remote_app_id: str) -> str:
     Look up the Service name for a RemoteApp (same namespace).
     Returns host suitable for in-cluster HTTP: '<name>.<namespace>.svc.cluster.local'
     or short form '<name>' when in same namespace.
-    Raises ValueError if no Service is found.
+    Raises ValueError if no Service is found. Served from the Service
+    watch index when possible; direct lookups are cached for _RESOLVE_TTL
+    seconds.
     """
+    _ensure_service_watch()
+    host = _svc_hosts.get(remote_app_id)
+    if host:
+        return host
+    now = time.monotonic()
+    with _resolve_lock:
+        hit = _resolve_cache.get(remote_app_id)
+    if hit and hit[0] > now:
+        return hit[1]
     core_v1 = _k8s_core_v1()
     services = core_v1.list_namespaced_service(
         namespace=NAMESPACE,
-        label_selector=f"porpulsion.io/remote-app-id={remote_app_id}",
+        label_selector=f"{_APP_LABEL}={remote_app_id}",
     )
     if not services.items:
         raise ValueError(f"no service for remote-app-id={remote_app_id}")
     name = services.items[0].metadata.name
-    return f"{name}.{NAMESPACE}.svc.cluster.local"
+    host = f"{name}.{NAMESPACE}.svc.cluster.local"
+    with _resolve_lock:
+        _resolve_cache[remote_app_id] = (now + _RESOLVE_TTL, host)
+    return host
+
+
+def invalidate_service_host(remote_app_id: str) -> None:
+    """Drop a cached resolve_service_host result (e.g. after a failed request)."""
+    _svc_hosts.pop(remote_app_id, None)
+    with _resolve_lock:
+        _resolve_cache.pop(remote_app_id, None)
+
+
+class _BodyStream:
+    """
+    Iterator over the upstream body as it arrives.
+
+    close() releases the pooled connection. A class rather than a generator:
+    closing a generator that was never started skips its finally block, which
+    would leak the connection when a reply is dropped before its first chunk.
+    """
+
+    __slots__ = ("_resp", "_chunks")
+
+    def __init__(self, resp, chunk_size: int = 64 * 1024):
+        self._resp = resp
+        self._chunks = resp.raw.stream(chunk_size, decode_content=False)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> bytes:
+        try:
+            return next(self._chunks)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        self._resp.close()
 
 
 def proxy_request(remote_app_id: str, port: int,
                   method: str, path: str,
-                  headers: dict, body: bytes) -> tuple[int, dict, bytes]:
+                  headers: dict, body: bytes) -> tuple[int, dict, Iterator[bytes]]:
     """
     Forward an HTTP request to the RemoteApp's Service (load-balanced across pods).
 
-    Returns (status_code, response_headers, response_body).
+    Returns (status_code, response_headers, body_chunks). The body is streamed
+    undecoded (Content-Encoding is passed through); callers that need it whole
+    can b"".join() it. Close the iterator if it isn't consumed to the end.
     """
-    import requests as _req
-
     host = resolve_service_host(remote_app_id)
     url = f"http://{host}:{port}/{path.lstrip('/')}"
 
-    # Strip hop-by-hop headers that must not be forwarded
-    _skip = {"host", "transfer-encoding", "connection", "keep-alive",
-              "proxy-authenticate", "proxy-authorization", "te", "trailers", "upgrade"}
-    fwd_headers = {k: v for k, v in headers.items() if k.lower() not in _skip}
+    fwd_headers = {k: v for k, v in headers.items() if k.lower() not in _SKIP}
 
     try:
-        resp = _req.request(
+        resp = _PROXY_SESSION.request(
             method=method,
             url=url,
             headers=fwd_headers,
             data=body,
             timeout=30,
             allow_redirects=False,
-            stream=False,
+            stream=True,
         )
         resp_headers = {k: v for k, v in resp.headers.items()
-                        if k.lower() not in _skip}
+                        if k.lower() not in _SKIP}
         log.debug("Proxied %s %s -> %s: %d", method, path, url, resp.status_code)
-        return resp.status_code, resp_headers, resp.content
+        return resp.status_code, resp_headers, _BodyStream(resp)
     except Exception as exc:
         log.warning("Proxy error for app %s port %d: %s", remote_app_id, port, exc)
+        invalidate_service_host(remote_app_id)
         raise
@@ -1,24 +1,31 @@
 """
 In-memory log buffer for exposing recent application logs via API/UI.
 
-Uses a custom logging.Handler that appends to a thread-safe bounded deque.
+Uses a custom logging.Handler that appends to a bounded deque. deque.append
+and the tail read in get_recent_logs run entirely in C under the GIL, so
+neither the emit path nor readers take a lock; _lock only guards one-time
+installation.
 """
 import logging
 import threading
 from collections import deque
+from itertools import islice
 from typing import Optional
 
 
 _LOG_FORMAT = "%(asctime)s [%(name)s] %(levelname)s %(message)s"
 _formatter = logging.Formatter(_LOG_FORMAT)
 
+# Record args that are safe to keep for lazy %-formatting (immutable)
+_SCALARS = (str, int, float, bool, type(None))
+
 _buffer: Optional[deque] = None
 _lock = threading.Lock()
 _handler: Optional["LogBufferHandler"] = None
 
 
 class LogBufferHandler(logging.Handler):
-    """Appends log records to a bounded, thread-safe deque as structured dicts."""
+    """Appends raw log record fields to a bounded deque; formatted on read."""
 
     def __init__(self, buffer: deque, capacity: int):
         super().__init__()
@@ -26,20 +33,43 @@ class LogBufferHandler(logging.Handler):
         self._capacity = capacity
 
     def emit(self, record: logging.LogRecord) -> None:
+        # Most records are evicted before anyone reads them, so only capture
+        # the raw pieces here and format in get_recent_logs. Args that aren't
+        # plain scalars could change after the call, so those are rendered now.
         try:
-            msg = self.format(record)
-            entry = {
-                "ts": record.created,
-                "name": record.name,
-                "level": record.levelname,
-                "message": msg,
-            }
-            with _lock:
-                self._buffer.append(entry)
+            msg, args = record.msg, record.args
+            if args and not all(isinstance(a, _SCALARS) for a in
+                                (args.values() if isinstance(args, dict) else args)):
+                msg, args = record.getMessage(), None
+            exc_text = record.exc_text
+            if record.exc_info and not exc_text:
+                exc_text = _formatter.formatException(record.exc_info)
+            self._buffer.append((record.created, record.msecs, record.name,
+                                 record.levelname, msg, args, exc_text,
+                                 record.stack_info))
         except Exception:
             self.handleError(record)
 
 
+def _render(entry: tuple) -> dict:
+    created, msecs, name, levelname, msg, args, exc_text, stack_info = entry
+    record = logging.makeLogRecord({
+        "created": created, "msecs": msecs, "name": name, "levelname": levelname,
+        "msg": msg, "args": args, "exc_text": exc_text, "stack_info": stack_info,
+    })
+    try:
+        message = _formatter.format(record)
+    except Exception:
+        # Bad format string/args; emit would have reported it via handleError
+        message = f"{msg!s} {args!r}"
+    return {
+        "ts": created,
+        "name": name,
+        "level": levelname,
+        "message": message,
+    }
+
+
 def install_log_handler(capacity: int = 1000) -> None:
     """Create the buffer and handler, attach to root logger."""
     global _buffer, _handler
@@ -54,12 +84,15 @@ def install_log_handler(capacity: int = 1000) -> None:
 
 def get_recent_logs(limit: int = 200) -> list[dict]:
     """Return the last `limit` log entries (each with ts, name, level, message)."""
-    with _lock:
-        if _buffer is None:
-            return []
-        # deque doesn't support slicing; take last limit by iterating
-        size = len(_buffer)
-        n = min(limit, size)
-        if n == 0:
-            return []
-        return list(_buffer)[-n:]
+    buf = _buffer
+    if buf is None:
+        return []
+    n = min(limit, len(buf))
+    if n <= 0:
+        return []
+    # deque doesn't support slicing; walk back n entries from the right end
+    # instead of copying the whole buffer (still one atomic C-level pass).
+    # buf.copy() would be atomic too, but costs O(capacity) rather than O(n).
+    tail = list(islice(reversed(buf), n))
+    tail.reverse()
+    return [_render(e) for e in tail]
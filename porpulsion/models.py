@@ -1,10 +1,22 @@
-import uuid
-from dataclasses import dataclass, field
+import secrets
+import sys
+from dataclasses import dataclass, field, fields
 from datetime import datetime, timezone
 from typing import Any, Literal
 
 
-@dataclass
+# Canonical (interned literal) objects for the known pull policies, so every
+# parsed spec shares them instead of holding its own copy from the JSON parser.
+# Unknown values pass through untouched; Kubernetes rejects them.
+_PULL_POLICIES = {p: p for p in ("Always", "IfNotPresent", "Never")}
+
+
+def utc_now_iso() -> str:
+    """Current UTC time as an ISO 8601 string (the timestamp format used on all models)."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+@dataclass(slots=True)
 class EnvVarSource:
     secretKeyRef: dict | None = None    # {"name": str, "key": str}
     configMapKeyRef: dict | None = None  # {"name": str, "key": str}
@@ -29,7 +41,7 @@ class EnvVarSource:
         return out
 
 
-@dataclass
+@dataclass(slots=True)
 class EnvVar:
     name: str
     value: str = ""
@@ -39,7 +51,7 @@ class EnvVar:
     def from_dict(cls, d: dict) -> "EnvVar":
         vf = d.get("valueFrom")
         return cls(
-            name=d["name"],
+            name=sys.intern(str(d["name"])),
             value=str(d.get("value", "")),
             valueFrom=EnvVarSource.from_dict(vf) if vf else None,
         )
@@ -53,14 +65,14 @@ class EnvVar:
         return out
 
 
-@dataclass
+@dataclass(slots=True)
 class PortSpec:
     port: int
     name: str = ""
 
     @classmethod
     def from_dict(cls, d: dict) -> "PortSpec":
-        return cls(port=int(d["port"]), name=str(d.get("name", "")))
+        return cls(port=int(d["port"]), name=sys.intern(str(d.get("name", ""))))
 
     def to_dict(self) -> dict:
         out: dict = {"port": self.port}
@@ -69,7 +81,7 @@ class PortSpec:
         return out
 
 
-@dataclass
+@dataclass(slots=True)
 class ResourceRequirements:
     """
     Kubernetes-native resource requests and limits.
@@ -102,7 +114,7 @@ class ResourceRequirements:
         return not self.requests and not self.limits
 
 
-@dataclass
+@dataclass(slots=True)
 class AdditionalConfigItem:
     """One file to mount: path in the container and its text content (stored in a ConfigMap)."""
     mountPath: str = ""
@@ -119,7 +131,7 @@ class AdditionalConfigItem:
         return {"mountPath": self.mountPath, "content": self.content}
 
 
-@dataclass
+@dataclass(slots=True)
 class ReadinessProbe:
     httpGet: dict | None = None    # {"path": str, "port": int}
     exec: dict | None = None       # {"command": [str]}
@@ -150,7 +162,7 @@ class ReadinessProbe:
         return out
 
 
-@dataclass
+@dataclass(slots=True)
 class SecurityContext:
     runAsNonRoot: bool | None = None
     runAsUser: int | None = None
@@ -170,14 +182,20 @@ class SecurityContext:
 
     def to_dict(self) -> dict:
         out: dict = {}
-        for k in ("runAsNonRoot", "runAsUser", "runAsGroup", "fsGroup", "readOnlyRootFilesystem"):
-            v = getattr(self, k)
-            if v is not None:
-                out[k] = v
+        if self.runAsNonRoot is not None:
+            out["runAsNonRoot"] = self.runAsNonRoot
+        if self.runAsUser is not None:
+            out["runAsUser"] = self.runAsUser
+        if self.runAsGroup is not None:
+            out["runAsGroup"] = self.runAsGroup
+        if self.fsGroup is not None:
+            out["fsGroup"] = self.fsGroup
+        if self.readOnlyRootFilesystem is not None:
+            out["readOnlyRootFilesystem"] = self.readOnlyRootFilesystem
         return out
 
 
-@dataclass
+@dataclass(slots=True)
 class RemoteAppSpec:
     """
     Typed schema for a RemoteApp spec. This is the authoritative model
@@ -257,6 +275,7 @@ class RemoteAppSpec:
         pull_secrets = d.get("imagePullSecrets")
         res_raw = d.get("resources")
         add_cfg = d.get("additionalConfig")
+        pull_policy = d.get("imagePullPolicy", "IfNotPresent")
         return cls(
             image=str(d.get("image", "nginx:latest")),
             replicas=max(1, int(d.get("replicas") or 1)),
@@ -271,7 +290,7 @@ class RemoteAppSpec:
                 if env_raw and isinstance(env_raw, list) else [],
             additionalConfig=[AdditionalConfigItem.from_dict(c) for c in add_cfg if isinstance(c, dict) and c.get("mountPath")]
                 if add_cfg and isinstance(add_cfg, list) else [],
-            imagePullPolicy=d.get("imagePullPolicy", "IfNotPresent"),
+            imagePullPolicy=_PULL_POLICIES.get(pull_policy, pull_policy),
             imagePullSecrets=list(pull_secrets)
                              if pull_secrets and isinstance(pull_secrets, list) else [],
             readinessProbe=ReadinessProbe.from_dict(rp_raw)
@@ -308,27 +327,36 @@ class RemoteAppSpec:
         return out
 
 
-@dataclass
+@dataclass(slots=True)
 class Peer:
     name: str
     url: str
-    ca_pem: str = ""  # PEM CA cert received from this peer during handshake (internal only)
-    connected_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    ca_pem: str = field(default="", metadata={"internal": True})  # PEM CA cert received from this peer during handshake
+    connected_at: str = field(default_factory=utc_now_iso)
 
     def to_dict(self):
         return {"name": self.name, "url": self.url, "connected_at": self.connected_at}
 
 
-@dataclass
+@dataclass(slots=True)
 class RemoteApp:
     name: str
     spec: RemoteAppSpec
     source_peer: str
-    id: str = field(default_factory=lambda: uuid.uuid4().hex[:8])
+    id: str = field(default_factory=lambda: secrets.token_hex(4))
     status: str = "Pending"
     target_peer: str = ""   # peer this app was submitted to (set on the submitting side)
-    created_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
-    updated_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    created_at: str = field(default_factory=utc_now_iso)
+    updated_at: str = field(default_factory=utc_now_iso)
+    deploy_name: str = field(default="", init=False, repr=False, compare=False,
+                             metadata={"internal": True})  # k8s object name
+    last_reported_status: str = field(default="", init=False, repr=False, compare=False,
+                                      metadata={"internal": True})  # last status pushed to the source peer
+
+    def __post_init__(self):
+        # Deployment/Service name for this app, capped to a DNS label. Computed
+        # once here so every k8s call and status poll shares the same rule.
+        self.deploy_name = f"ra-{self.id}-{self.name}"[:63]
 
     def to_dict(self):
         return {
@@ -343,7 +371,7 @@ class RemoteApp:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class TunnelRequest:
     """A pending tunnel request from a peer, waiting for local approval."""
     id: str
@@ -351,20 +379,16 @@ class TunnelRequest:
     remote_app_id: str
     target_port: int
     status: Literal["pending", "approved", "rejected"] = "pending"
-    requested_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    requested_at: str = field(default_factory=utc_now_iso)
 
     def to_dict(self):
-        return {
-            "id": self.id,
-            "peer_name": self.peer_name,
-            "remote_app_id": self.remote_app_id,
-            "target_port": self.target_port,
-            "status": self.status,
-            "requested_at": self.requested_at,
-        }
+        return {name: getattr(self, name) for name in _TUNNEL_REQUEST_FIELDS}
+
 
+_TUNNEL_REQUEST_FIELDS = tuple(f.name for f in fields(TunnelRequest))
 
-@dataclass
+
+@dataclass(slots=True)
 class AgentSettings:
     """
     Persistent (in-memory) settings for this agent.
@@ -430,25 +454,8 @@ class AgentSettings:
     max_total_memory_requests: str = ""
 
     def to_dict(self):
-        return {
-            "require_resource_requests": self.require_resource_requests,
-            "require_resource_limits": self.require_resource_limits,
-            "allow_inbound_remoteapps": self.allow_inbound_remoteapps,
-            "require_remoteapp_approval": self.require_remoteapp_approval,
-            "allowed_images": self.allowed_images,
-            "blocked_images": self.blocked_images,
-            "allowed_source_peers": self.allowed_source_peers,
-            "allow_inbound_tunnels": self.allow_inbound_tunnels,
-            "tunnel_approval_mode": self.tunnel_approval_mode,
-            "allowed_tunnel_peers": self.allowed_tunnel_peers,
-            "log_level": self.log_level,
-            "max_cpu_request_per_pod": self.max_cpu_request_per_pod,
-            "max_cpu_limit_per_pod": self.max_cpu_limit_per_pod,
-            "max_memory_request_per_pod": self.max_memory_request_per_pod,
-            "max_memory_limit_per_pod": self.max_memory_limit_per_pod,
-            "max_replicas_per_app": self.max_replicas_per_app,
-            "max_total_deployments": self.max_total_deployments,
-            "max_total_pods": self.max_total_pods,
-            "max_total_cpu_requests": self.max_total_cpu_requests,
-            "max_total_memory_requests": self.max_total_memory_requests,
-        }
+        # Every setting, in declaration order; new fields need no edit here.
+        return {name: getattr(self, name) for name in _SETTINGS_FIELDS}
+
+
+_SETTINGS_FIELDS = tuple(f.name for f in fields(AgentSettings))
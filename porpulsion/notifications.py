@@ -5,27 +5,25 @@ Any backend module can call add_notification() to surface a persistent
 notification under the bell icon in the UI. Import here is deferred to
 avoid circular imports with state.py.
 """
-import uuid
-from datetime import datetime, timezone
+import secrets
 
-_MAX = 50   # cap to prevent unbounded growth
+from porpulsion.models import utc_now_iso
 
 
 def add_notification(level: str, title: str, message: str):
     """
-    Append a notification to state.notifications.
+    Prepend a notification to state.notifications (a bounded deque, so the
+    oldest entry falls off once the cap is reached).
 
     level: "info" | "warn" | "error"
     """
     from porpulsion import state
     n = {
-        "id": uuid.uuid4().hex[:12],
+        "id": secrets.token_hex(6),
         "level": level,
         "title": title,
         "message": message,
-        "ts": datetime.now(timezone.utc).isoformat(),
+        "ts": utc_now_iso(),
         "ack": False,
     }
-    state.notifications.insert(0, n)
-    if len(state.notifications) > _MAX:
-        state.notifications[:] = state.notifications[:_MAX]
+    state.notifications.appendleft(n)
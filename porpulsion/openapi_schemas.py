@@ -5,11 +5,22 @@ Single source of truth: schemas are derived from porpulsion.models, not duplicat
 from __future__ import annotations
 
 import dataclasses
-from typing import Any, Literal, get_args, get_origin
+import functools
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Literal, get_args, get_origin, get_type_hints
 
 from porpulsion import models
 
 
+_PRIMITIVE_SCHEMAS: dict[type, dict[str, str]] = {
+    str: {"type": "string"},
+    int: {"type": "integer"},
+    bool: {"type": "boolean"},
+    float: {"type": "number"},
+}
+
+
 def _type_to_schema(typ: Any, refs: dict[type, str]) -> dict[str, Any]:
     """Map a Python type to an OpenAPI schema dict. refs maps dataclass -> component name for $ref."""
     if typ is type(None):
@@ -43,36 +54,44 @@ def _type_to_schema(typ: Any, refs: dict[type, str]) -> dict[str, Any]:
         return {"$ref": f"#/components/schemas/{refs[typ]}"}
 
     # primitives
-    if typ is str or typ == str:
-        return {"type": "string"}
-    if typ is int or typ == int:
-        return {"type": "integer"}
-    if typ is bool or typ == bool:
-        return {"type": "boolean"}
-    if typ is float or typ == float:
-        return {"type": "number"}
+    s = _PRIMITIVE_SCHEMAS.get(typ)
+    if s is not None:
+        return dict(s)
 
     return {"type": "object"}
 
 
-def _dataclass_to_schema(cls: type, refs: dict[type, str]) -> dict[str, Any]:
-    """Build OpenAPI schema for a dataclass from its fields and type hints."""
-    hints = {}
+@functools.lru_cache(maxsize=None)
+def _hints(cls: type) -> dict[str, Any]:
+    """Resolved type hints for a model class (cached; models don't change at runtime)."""
     try:
-        hints = __import__("typing").get_type_hints(cls)
+        return get_type_hints(cls)
     except Exception:
-        pass
+        return {}
+
+
+@functools.lru_cache(maxsize=None)
+def _fields(cls: type) -> tuple[dataclasses.Field, ...]:
+    """dataclasses.fields(cls), cached alongside _hints."""
+    return dataclasses.fields(cls)
+
+
+def _dataclass_to_schema(cls: type, refs: dict[type, str]) -> dict[str, Any]:
+    """
+    Build OpenAPI schema for a dataclass from its fields and type hints.
+
+    Fields marked field(metadata={"internal": True}) are never serialised to
+    API clients and are left out.
+    """
+    hints = _hints(cls)
     properties: dict[str, Any] = {}
     required: list[str] = []
-    for f in dataclasses.fields(cls):
+    for f in _fields(cls):
         name = f.name
-        if name.startswith("_"):
+        if name.startswith("_") or f.metadata.get("internal"):
             continue
         typ = hints.get(name, f.type)
-        schema = _type_to_schema(typ, refs)
-        if name == "ca_pem":
-            continue
-        properties[name] = schema
+        properties[name] = _type_to_schema(typ, refs)
         if f.default is dataclasses.MISSING and f.default_factory is dataclasses.MISSING:
             required.append(name)
     out: dict[str, Any] = {"type": "object", "properties": properties}
@@ -191,8 +210,12 @@ REMOTE_APP_SPEC_EXAMPLES = [
 ]
 
 
-def schemas_from_models() -> dict[str, dict[str, Any]]:
-    """Return OpenAPI components/schemas dict keyed by schema name, derived from models."""
+@functools.cache
+def schemas_from_models() -> Mapping[str, dict[str, Any]]:
+    """
+    Return OpenAPI components/schemas keyed by schema name, derived from models.
+    Built once; the result is a read-only view shared by every caller.
+    """
     out: dict[str, dict[str, Any]] = {}
     for cls, name in MODEL_ORDER:
         out[name] = _dataclass_to_schema(cls, REF_MAP)
@@ -211,7 +234,7 @@ def schemas_from_models() -> dict[str, dict[str, Any]]:
         for prop, desc in ADDITIONAL_CONFIG_ITEM_PROPERTY_DESCRIPTIONS.items():
             if "properties" in s and prop in s["properties"]:
                 s["properties"][prop]["description"] = desc
-    return out
+    return MappingProxyType(out)
 
 
 def remote_app_request_examples() -> dict[str, Any]:
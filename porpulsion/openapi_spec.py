@@ -2,8 +2,11 @@
 OpenAPI 3 spec: paths defined here, schemas marshalled from porpulsion.models.
 Served at /openapi.json and /openapi.yaml.
 """
-from apispec import APISpec
+import functools
+import gzip
+import hashlib
 
+from porpulsion.json_utils import dumps_bytes
 from porpulsion.openapi_schemas import (
     peer_entry_schema,
     remote_app_request_examples,
@@ -17,28 +20,39 @@ REF_PEER_ENTRY = {"$ref": "#/components/schemas/PeerEntry"}
 REF_REMOTE_APP = {"$ref": "#/components/schemas/RemoteApp"}
 REF_REMOTE_APP_SPEC = {"$ref": "#/components/schemas/RemoteAppSpec"}
 REF_SETTINGS = {"$ref": "#/components/schemas/Settings"}
+REF_PEER_CONNECT_REQUEST = {"$ref": "#/components/schemas/PeerConnectRequest"}
 
+# Request bodies shared by more than one path
+PEER_CONNECT_REQUEST_SCHEMA = {
+    "type": "object",
+    "required": ["url", "invite_token", "ca_fingerprint"],
+    "properties": {
+        "url": {"type": "string"},
+        "invite_token": {"type": "string"},
+        "ca_fingerprint": {"type": "string"},
+    },
+}
 
-def build_spec() -> APISpec:
-    spec = APISpec(
-        title="Porpulsion Agent API",
-        version="1.0.0",
-        openapi_version="3.0.3",
-        info=dict(
-            description=(
-                "Local management API for the Porpulsion agent (port 8000, internal only). "
-                "Use the dashboard at `/` or `/ui`, or call these endpoints to manage peers, "
-                "RemoteApps, tunnels, and settings."
-            ),
-        ),
-    )
-    spec.options["servers"] = [{"url": "/api", "description": "API base"}]
 
+def build_spec() -> dict:
+    """
+    Assemble the OpenAPI 3 document as a plain dict.
+
+    Everything here is static, so it is built directly rather than through
+    a spec-builder library; get_openapi_dict() caches the result.
+    """
     # ── Components: schemas from models (marshalling only, no duplication) ──
-    spec.components.schema("PeerEntry", peer_entry_schema())
-    spec.components.schema("Status", status_schema())
-    for name, schema in schemas_from_models().items():
-        spec.components.schema(name, schema)
+    schemas = {
+        "PeerEntry": peer_entry_schema(),
+        "Status": status_schema(),
+        "PeerConnectRequest": PEER_CONNECT_REQUEST_SCHEMA,
+    }
+    schemas.update(schemas_from_models())
+
+    paths: dict[str, dict] = {}
+
+    def add_path(path, operations):
+        paths.setdefault(path, {}).update(operations)
 
     # ── Paths ──
     def resp_json(schema, status="200", description="OK"):
@@ -49,7 +63,7 @@ def build_spec() -> APISpec:
             }
         }
 
-    spec.path(
+    add_path(
         path="/status",
         operations=dict(
             get=dict(
@@ -60,7 +74,7 @@ def build_spec() -> APISpec:
             )
         ),
     )
-    spec.path(
+    add_path(
         path="/peers",
         operations=dict(
             get=dict(
@@ -73,7 +87,7 @@ def build_spec() -> APISpec:
             )
         ),
     )
-    spec.path(
+    add_path(
         path="/peer",
         operations=dict(
             post=dict(
@@ -126,7 +140,7 @@ def build_spec() -> APISpec:
             )
         ),
     )
-    spec.path(
+    add_path(
         path="/peers/inbound",
         operations=dict(
             get=dict(
@@ -150,7 +164,7 @@ def build_spec() -> APISpec:
             )
         ),
     )
-    spec.path(
+    add_path(
         path="/peers/inbound/{req_id}/accept",
         operations=dict(
             post=dict(
@@ -173,7 +187,7 @@ def build_spec() -> APISpec:
             )
         ),
     )
-    spec.path(
+    add_path(
         path="/peers/inbound/{req_id}",
         operations=dict(
             delete=dict(
@@ -185,7 +199,7 @@ def build_spec() -> APISpec:
             )
         ),
     )
-    spec.path(
+    add_path(
         path="/peers/{peer_name}",
         operations=dict(
             delete=dict(
@@ -207,7 +221,7 @@ def build_spec() -> APISpec:
             )
         ),
     )
-    spec.path(
+    add_path(
         path="/peer/disconnect",
         operations=dict(
             post=dict(
@@ -234,7 +248,7 @@ def build_spec() -> APISpec:
             )
         ),
     )
-    spec.path(
+    add_path(
         path="/peers/retry",
         operations=dict(
             post=dict(
@@ -245,15 +259,7 @@ def build_spec() -> APISpec:
                     "required": True,
                     "content": {
                         "application/json": {
-                            "schema": {
-                                "type": "object",
-                                "required": ["url", "invite_token", "ca_fingerprint"],
-                                "properties": {
-                                    "url": {"type": "string"},
-                                    "invite_token": {"type": "string"},
-                                    "ca_fingerprint": {"type": "string"},
-                                },
-                            }
+                            "schema": REF_PEER_CONNECT_REQUEST
                         }
                     },
                 },
@@ -261,7 +267,7 @@ def build_spec() -> APISpec:
             )
         ),
     )
-    spec.path(
+    add_path(
         path="/peers/connecting",
         operations=dict(
             delete=dict(
@@ -277,7 +283,7 @@ def build_spec() -> APISpec:
             )
         ),
     )
-    spec.path(
+    add_path(
         path="/peers/connect",
         operations=dict(
             post=dict(
@@ -288,15 +294,7 @@ def build_spec() -> APISpec:
                     "required": True,
                     "content": {
                         "application/json": {
-                            "schema": {
-                                "type": "object",
-                                "required": ["url", "invite_token", "ca_fingerprint"],
-                                "properties": {
-                                    "url": {"type": "string"},
-                                    "invite_token": {"type": "string"},
-                                    "ca_fingerprint": {"type": "string"},
-                                },
-                            }
+                            "schema": REF_PEER_CONNECT_REQUEST
                         }
                     },
                 },
@@ -304,7 +302,7 @@ def build_spec() -> APISpec:
             )
         ),
     )
-    spec.path(
+    add_path(
         path="/token",
         operations=dict(
             get=dict(
@@ -333,7 +331,7 @@ def build_spec() -> APISpec:
             )
         ),
     )
-    spec.path(
+    add_path(
         path="/remoteapp",
         operations=dict(
             post=dict(
@@ -362,7 +360,7 @@ def build_spec() -> APISpec:
             )
         ),
     )
-    spec.path(
+    add_path(
         path="/remoteapp/pending-approval",
         operations=dict(
             get=dict(
@@ -373,7 +371,7 @@ def build_spec() -> APISpec:
             )
         ),
     )
-    spec.path(
+    add_path(
         path="/remoteapp/{app_id}/approve",
         operations=dict(
             post=dict(
@@ -385,7 +383,7 @@ def build_spec() -> APISpec:
             )
         ),
     )
-    spec.path(
+    add_path(
         path="/remoteapp/{app_id}/reject",
         operations=dict(
             post=dict(
@@ -397,7 +395,7 @@ def build_spec() -> APISpec:
             )
         ),
     )
-    spec.path(
+    add_path(
         path="/remoteapps",
         operations=dict(
             get=dict(
@@ -423,7 +421,7 @@ def build_spec() -> APISpec:
             )
         ),
     )
-    spec.path(
+    add_path(
         path="/remoteapp/{app_id}",
         operations=dict(
             delete=dict(
@@ -435,7 +433,7 @@ def build_spec() -> APISpec:
             )
         ),
     )
-    spec.path(
+    add_path(
         path="/remoteapp/{app_id}/scale",
         operations=dict(
             post=dict(
@@ -464,7 +462,7 @@ def build_spec() -> APISpec:
             )
         ),
     )
-    spec.path(
+    add_path(
         path="/remoteapp/{app_id}/detail",
         operations=dict(
             get=dict(
@@ -489,7 +487,7 @@ def build_spec() -> APISpec:
             )
         ),
     )
-    spec.path(
+    add_path(
         path="/remoteapp/{app_id}/spec",
         operations=dict(
             put=dict(
@@ -518,7 +516,7 @@ def build_spec() -> APISpec:
             )
         ),
     )
-    spec.path(
+    add_path(
         path="/remoteapp/{app_id}/proxy/{port}",
         operations=dict(
             get=dict(summary="Proxy to RemoteApp (GET)", description="Proxy HTTP request to the app pod on the peer."),
@@ -530,7 +528,7 @@ def build_spec() -> APISpec:
             options=dict(summary="Proxy to RemoteApp (OPTIONS)"),
         ),
     )
-    spec.path(
+    add_path(
         path="/remoteapp/{app_id}/proxy/{port}/{path}",
         operations=dict(
             get=dict(summary="Proxy to RemoteApp path (GET)"),
@@ -542,7 +540,7 @@ def build_spec() -> APISpec:
             options=dict(summary="Proxy to RemoteApp path (OPTIONS)"),
         ),
     )
-    spec.path(
+    add_path(
         path="/settings",
         operations=dict(
             get=dict(
@@ -563,7 +561,7 @@ def build_spec() -> APISpec:
             ),
         ),
     )
-    spec.path(
+    add_path(
         path="/logs",
         operations=dict(
             get=dict(
@@ -593,7 +591,7 @@ def build_spec() -> APISpec:
             )
         ),
     )
-    spec.path(
+    add_path(
         path="/remoteapp/{app_id}/logs",
         operations=dict(
             get=dict(
@@ -634,7 +632,7 @@ def build_spec() -> APISpec:
             )
         ),
     )
-    spec.path(
+    add_path(
         path="/notifications",
         operations=dict(
             get=dict(
@@ -663,7 +661,7 @@ def build_spec() -> APISpec:
             ),
         ),
     )
-    spec.path(
+    add_path(
         path="/notifications/{notif_id}/ack",
         operations=dict(
             post=dict(
@@ -674,7 +672,7 @@ def build_spec() -> APISpec:
             )
         ),
     )
-    spec.path(
+    add_path(
         path="/notifications/{notif_id}",
         operations=dict(
             delete=dict(
@@ -685,27 +683,74 @@ def build_spec() -> APISpec:
             )
         ),
     )
-    return spec
+    return {
+        "openapi": "3.0.3",
+        "info": {
+            "title": "Porpulsion Agent API",
+            "version": "1.0.0",
+            "description": (
+                "Local management API for the Porpulsion agent (port 8000, internal only). "
+                "Use the dashboard at `/` or `/ui`, or call these endpoints to manage peers, "
+                "RemoteApps, tunnels, and settings."
+            ),
+        },
+        "servers": [{"url": "/api", "description": "API base"}],
+        "paths": paths,
+        "components": {"schemas": schemas},
+    }
 
 
-# Lazy singleton so we build once
-_spec: APISpec | None = None
+# The spec is static for the life of the process: build it, and render each
+# served form, once on first request.
+@functools.cache
+def get_openapi_dict() -> dict:
+    """Return the OpenAPI spec as a dict. Shared; don't mutate."""
+    return build_spec()
 
 
-def get_openapi_dict() -> dict:
-    """Return the OpenAPI spec as a dict (for JSON response)."""
-    global _spec
-    if _spec is None:
-        _spec = build_spec()
-    return _spec.to_dict()
+@functools.cache
+def get_openapi_json_bytes() -> bytes:
+    """Return the encoded /openapi.json response body."""
+    return dumps_bytes(get_openapi_dict())
 
 
+@functools.cache
 def get_openapi_yaml() -> str:
-    """Return the OpenAPI spec as YAML (for /openapi.yaml)."""
+    """Return the OpenAPI spec as YAML."""
     import yaml
+    try:
+        base = yaml.CSafeDumper   # libyaml C emitter
+    except AttributeError:
+        base = yaml.SafeDumper
+
+    class dumper(base):
+        # The REF_* dicts are shared across paths; write them out in full
+        # rather than as &id/*id anchors.
+        def ignore_aliases(self, data):
+            return True
+
     return yaml.dump(
         get_openapi_dict(),
+        Dumper=dumper,
         default_flow_style=False,
         allow_unicode=True,
         sort_keys=False,
     )
+
+
+@functools.cache
+def get_openapi_yaml_bytes() -> bytes:
+    """Return the encoded /openapi.yaml response body."""
+    return get_openapi_yaml().encode()
+
+
+@functools.cache
+def get_openapi_gzip(body: bytes) -> bytes:
+    """Gzip one of the cached spec bodies above (compressed once per body)."""
+    return gzip.compress(body, 9)
+
+
+@functools.cache
+def get_openapi_etag(body: bytes) -> str:
+    """Strong ETag for one of the cached spec bodies above."""
+    return hashlib.blake2b(body, digest_size=8).hexdigest()
@@ -6,29 +6,116 @@ Exposes only the two endpoints that remote peers need to reach:
   GET  /ws     — persistent WebSocket channel
 
 Everything else (dashboard, local API) lives on port 8000 and is never
-exposed via the Ingress.
+exposed via the Ingress. peer_ws is only routed here; the dashboard app
+does not register a WebSocket route at all.
 """
 import logging
+import os
+import threading
 
 from flask import Flask
 from flask_sock import Sock
 
+from porpulsion import json_utils
+from porpulsion.channel import PING_INTERVAL
 from porpulsion.routes.peers import accept_peer
 from porpulsion.routes.ws import peer_ws
 
 log = logging.getLogger("porpulsion.peer_server")
 
 peer_app = Flask(__name__)
+json_utils.install(peer_app)
 
 peer_app.add_url_rule("/peer", view_func=accept_peer, methods=["POST"])
 
+# simple_websocket sends protocol-level pings on inbound channels and drops
+# the connection when pongs stop; outbound channels are pinged by the shared
+# keepalive thread in porpulsion.channel.
+peer_app.config["SOCK_SERVER_OPTIONS"] = {"ping_interval": PING_INTERVAL}
+
 sock = Sock(peer_app)
 sock.route("/ws")(peer_ws)
 
+# Set once the listening socket is bound, so callers can wait for /ws to be
+# reachable instead of sleeping a fixed amount.
+ready = threading.Event()
+
+
+# Peer server connection limits. Handshake connections (/peer, and /ws
+# until it upgrades) are capped so a reconnect storm queues at accept()
+# instead of growing threads without limit; a warning is logged when the cap
+# is hit. Idle keep-alive connections are dropped after _IDLE_TIMEOUT so they
+# can't sit on a slot. Upgraded /ws channels live as long as the peer is
+# connected, so they give their slot back and run with no socket timeout.
+_MAX_CONNECTIONS = int(os.environ.get("PORPULSION_PEER_SERVER_CONNECTIONS", "64"))
+_IDLE_TIMEOUT = 15   # seconds a non-upgraded connection may sit without sending
+
+
+def make_bounded_server(host: str, port: int, app, max_connections: int = _MAX_CONNECTIONS,
+                        name: str = "Peer server"):
+    """
+    Werkzeug's threaded server with a cap on concurrent non-WebSocket connections.
+
+    Also used for the dashboard (port 8000), with its own cap.
+    """
+    from werkzeug.serving import ThreadedWSGIServer, WSGIRequestHandler
+
+    class _BoundedRequestHandler(WSGIRequestHandler):
+        timeout = _IDLE_TIMEOUT
+
+        def make_environ(self):
+            environ = super().make_environ()
+            if environ.get("HTTP_UPGRADE", "").lower() == "websocket":
+                # Cleared before simple_websocket starts reading the socket
+                self.connection.settimeout(None)
+                self.server.release_slot(self.request)
+            return environ
+
+        def log_error(self, format, *args):
+            if format.startswith("Request timed out"):
+                return   # idle keep-alive connection reaching _IDLE_TIMEOUT — routine
+            super().log_error(format, *args)
+
+    class _BoundedWSGIServer(ThreadedWSGIServer):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._slots = threading.BoundedSemaphore(max_connections)
+            self._held: set = set()
+            self._held_lock = threading.Lock()
+
+        def process_request(self, request, client_address):
+            if not self._slots.acquire(blocking=False):
+                log.warning("%s saturated: %d connections in progress — "
+                            "new connections wait", name, max_connections)
+                self._slots.acquire()
+            with self._held_lock:
+                self._held.add(request)
+            try:
+                super().process_request(request, client_address)
+            except Exception:
+                self.release_slot(request)
+                raise
+
+        def process_request_thread(self, request, client_address):
+            try:
+                super().process_request_thread(request, client_address)
+            finally:
+                self.release_slot(request)
+
+        def release_slot(self, request):
+            """Give back request's slot; a no-op if it was already released."""
+            with self._held_lock:
+                if request not in self._held:
+                    return
+                self._held.discard(request)
+            self._slots.release()
+
+    return _BoundedWSGIServer(host, port, app, handler=_BoundedRequestHandler)
+
 
 def start(port: int = 8001):
     """Start the peer-facing server in the calling thread (run in a daemon thread)."""
-    from werkzeug.serving import make_server
     log.info("Starting peer-facing server on port %d", port)
-    srv = make_server("0.0.0.0", port, peer_app, threaded=True)
+    srv = make_bounded_server("0.0.0.0", port, peer_app)
+    ready.set()
     srv.serve_forever()
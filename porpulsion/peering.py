@@ -1,8 +1,7 @@
 import logging
-import time
 import threading
 import requests
-import urllib3
+from porpulsion.http_client import BOOTSTRAP_SESSION
 from porpulsion.models import Peer
 
 log = logging.getLogger("porpulsion.peering")
@@ -21,9 +20,15 @@ def initiate_peering(agent_name, self_url, peer_url, invite_token,
 
     pending_peers is mutated: the entry for peer_url is updated with attempt counts
     and removed (by the confirmation handler in agent.py) once fully peered.
+    Its "cancel" Event (created here if the caller didn't) is set to stop the
+    retry loop without waiting out the current backoff.
     """
+    cancel = pending_peers[peer_url].setdefault("cancel", threading.Event())
 
     def _attempt():
+        # Shared bootstrap session: once the peer is reachable, a rejected
+        # attempt leaves a keep-alive connection the next one reuses instead
+        # of paying a fresh TCP + TLS handshake.
         from porpulsion import tls
         write_temp_pem = tls.write_temp_pem
 
@@ -34,12 +39,10 @@ def initiate_peering(agent_name, self_url, peer_url, invite_token,
             pending_peers[peer_url]["attempts"] = attempt
 
             try:
-                urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-                resp = requests.post(
+                resp = BOOTSTRAP_SESSION.post(
                     f"{peer_url}/peer",
                     json={"name": agent_name, "url": self_url, "ca": ca_pem_str},
                     headers={"X-Invite-Token": invite_token},
-                    verify=False,   # bootstrap-only: no CA to verify yet
                     timeout=3,
                 )
                 if resp.status_code == 200:
@@ -85,12 +88,9 @@ def initiate_peering(agent_name, self_url, peer_url, invite_token,
                 log.warning("Peer rejected our invite (status %s)", resp.status_code)
             except requests.ConnectionError:
                 log.debug("Peer %s not up yet (attempt %d/%d)", peer_url, attempt, max_retries)
-            # Sleep in short intervals so a cancel is picked up within ~0.2s
-            for _ in range(10):
-                if peer_url not in pending_peers:
-                    log.info("Peering to %s cancelled during wait", peer_url)
-                    return
-                time.sleep(0.2)
+            if cancel.wait(2.0) or peer_url not in pending_peers:
+                log.info("Peering to %s cancelled during wait", peer_url)
+                return
 
         # Give up — mark as failed so the UI can show a Retry button
         if peer_url in pending_peers:
@@ -149,6 +149,7 @@ def verify_peer(request, peers):
     Checks that the presented leaf cert was issued by one of our known peer CAs.
     """
     from cryptography.x509 import load_pem_x509_certificate
+    from porpulsion.tls import load_ca_cert
 
     client_cert_pem = _extract_client_cert(request)
     if not client_cert_pem:
@@ -169,8 +170,7 @@ def verify_peer(request, peers):
         if not peer.ca_pem:
             continue
         try:
-            ca = load_pem_x509_certificate(
-                peer.ca_pem.encode() if isinstance(peer.ca_pem, str) else peer.ca_pem)
+            ca = load_ca_cert(peer.ca_pem)
             if leaf_issuer_dn == ca.subject:
                 return True
         except Exception:
@@ -186,6 +186,7 @@ def identify_peer(request, peers) -> str | None:
     Used where the caller needs to know *which* peer is calling.
     """
     from cryptography.x509 import load_pem_x509_certificate
+    from porpulsion.tls import load_ca_cert
 
     client_cert_pem = _extract_client_cert(request)
     if not client_cert_pem:
@@ -202,8 +203,7 @@ def identify_peer(request, peers) -> str | None:
         if not peer.ca_pem:
             continue
         try:
-            ca = load_pem_x509_certificate(
-                peer.ca_pem.encode() if isinstance(peer.ca_pem, str) else peer.ca_pem)
+            ca = load_ca_cert(peer.ca_pem)
             if leaf_issuer_dn == ca.subject:
                 return peer.name
         except Exception:
@@ -11,12 +11,12 @@ bp = Blueprint("notifications", __name__)
 
 @bp.route("/notifications")
 def list_notifications():
-    return jsonify(state.notifications)
+    return jsonify(list(state.notifications))
 
 
 @bp.route("/notifications/<notif_id>/ack", methods=["POST"])
 def ack_notification(notif_id):
-    for n in state.notifications:
+    for n in list(state.notifications):
         if n["id"] == notif_id:
             n["ack"] = True
             return jsonify({"ok": True})
@@ -25,9 +25,14 @@ def ack_notification(notif_id):
 
 @bp.route("/notifications/<notif_id>", methods=["DELETE"])
 def delete_notification(notif_id):
-    before = len(state.notifications)
-    state.notifications[:] = [n for n in state.notifications if n["id"] != notif_id]
-    return jsonify({"ok": len(state.notifications) < before})
+    for n in list(state.notifications):
+        if n["id"] == notif_id:
+            try:
+                state.notifications.remove(n)
+            except ValueError:
+                break   # evicted by a newer notification meanwhile
+            return jsonify({"ok": True})
+    return jsonify({"ok": False})
 
 
 @bp.route("/notifications", methods=["DELETE"])
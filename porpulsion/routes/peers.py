@@ -1,13 +1,12 @@
 import logging
 import secrets
-import uuid
+import threading
 from datetime import datetime, timezone
 
-import requests as _req
-import urllib3 as _urllib3
 from flask import Blueprint, request, jsonify
 
 from porpulsion import state, tls
+from porpulsion.http_client import BOOTSTRAP_SESSION
 from porpulsion.models import Peer
 from porpulsion.peering import initiate_peering
 from porpulsion.channel import open_channel_to
@@ -102,7 +101,7 @@ def accept_peer():
     tls.persist_token(state.NAMESPACE, state.invite_token)
     log.info("Invite token consumed — queuing inbound request from %s", peer_name)
 
-    req_id = uuid.uuid4().hex[:12]
+    req_id = secrets.token_hex(6)
     state.pending_inbound[req_id] = {
         "id": req_id,
         "name": peer_name,
@@ -134,12 +133,9 @@ def accept_inbound(req_id):
     peer_url  = info["url"]
     peer_ca   = info.get("ca_pem", "")
 
-    _urllib3.disable_warnings(_urllib3.exceptions.InsecureRequestWarning)
-    session = _req.Session()
-    session.verify = False  # no CA pinned yet at this stage — bootstrap trust
-
     try:
-        resp = session.post(
+        # No CA pinned yet at this stage — bootstrap trust
+        resp = BOOTSTRAP_SESSION.post(
             f"{peer_url}/peer",
             json={"name": state.AGENT_NAME, "url": state.SELF_URL,
                   "ca": state.AGENT_CA_PEM.decode()},
@@ -254,9 +250,13 @@ def retry_connecting_peer():
     if not ca_fingerprint:
         return jsonify({"error": "ca_fingerprint is required to retry"}), 400
 
+    previous = state.pending_peers.get(peer_url)
+    if previous and "cancel" in previous:
+        previous["cancel"].set()   # stop any loop still running for this URL
     state.pending_peers[peer_url] = {
         "name": peer_url, "url": peer_url,
         "since": datetime.now(timezone.utc).isoformat(), "attempts": 0,
+        "cancel": threading.Event(),
     }
     initiate_peering(state.AGENT_NAME, state.SELF_URL, peer_url, token,
                      state.peers, state.pending_peers,
@@ -270,8 +270,10 @@ def cancel_connecting_peer():
     peer_url = request.args.get("url", "")
     if not peer_url:
         return jsonify({"error": "url query parameter required"}), 400
-    if peer_url in state.pending_peers:
-        del state.pending_peers[peer_url]
+    info = state.pending_peers.pop(peer_url, None)
+    if info is not None:
+        if "cancel" in info:
+            info["cancel"].set()
         log.info("Cancelled pending connection to %s", peer_url)
         return jsonify({"ok": True, "cancelled": peer_url})
     return jsonify({"error": "no pending connection to that URL"}), 404
@@ -312,6 +314,7 @@ def connect_peer():
     state.pending_peers[url] = {
         "name": url, "url": url,
         "since": datetime.now(timezone.utc).isoformat(), "attempts": 0,
+        "cancel": threading.Event(),
     }
     initiate_peering(state.AGENT_NAME, state.SELF_URL, url, token,
                      state.peers, state.pending_peers,
@@ -1,4 +1,4 @@
-import base64
+import binascii
 import logging
 
 from flask import Blueprint, request, jsonify, Response
@@ -45,20 +45,26 @@ def proxy_remoteapp(app_id, port, subpath):
 
     try:
         ch = get_channel(peer.name)
-        result = ch.call("proxy/request", {
+        result, chunks = ch.call_stream("proxy/request", {
             "app_id": app_id,
             "port": port,
             "method": request.method,
             "path": path,
             "headers": fwd_headers,
-            "body": base64.b64encode(request.get_data()).decode(),
+            # msgpack frames carry bytes natively; the JSON codec base64s them
+            "body": request.get_data(),
         }, timeout=30)
     except Exception as exc:
         return jsonify({"error": f"failed to reach peer: {exc}"}), 502
 
     resp_headers = {k: v for k, v in result.get("headers", {}).items()
                     if k.lower() not in _HOP_BY_HOP}
-    body = base64.b64decode(result.get("body", ""))
+    if chunks is not None:
+        # Peer streams the body — relay chunks as they arrive
+        return Response(chunks, status=result.get("status", 502), headers=resp_headers)
+    body = result.get("body", b"")
+    if isinstance(body, str):
+        body = binascii.a2b_base64(body)
     return Response(body, status=result.get("status", 502), headers=resp_headers)
 
 
@@ -14,31 +14,43 @@ def _context():
     return {"agent_name": state.AGENT_NAME}
 
 
+# Rendered HTML per template. A page depends only on agent_name (fixed at
+# startup) and its own endpoint, so each one is rendered once per process.
+_rendered: dict[str, str] = {}
+
+
+def _render(template: str) -> str:
+    html = _rendered.get(template)
+    if html is None:
+        html = _rendered[template] = render_template(template, **_context())
+    return html
+
+
 @bp.route("/")
 def index():
-    return render_template("ui/overview.html", **_context())
+    return _render("ui/overview.html")
 
 
 @bp.route("/peers")
 def peers():
-    return render_template("ui/peers.html", **_context())
+    return _render("ui/peers.html")
 
 
 @bp.route("/workloads")
 def workloads():
-    return render_template("ui/workloads.html", **_context())
+    return _render("ui/workloads.html")
 
 
 @bp.route("/tunnels")
 def tunnels():
-    return render_template("ui/tunnels.html", **_context())
+    return _render("ui/tunnels.html")
 
 
 @bp.route("/settings")
 def settings():
-    return render_template("ui/settings.html", **_context())
+    return _render("ui/settings.html")
 
 
 @bp.route("/docs")
 def docs():
-    return render_template("ui/docs.html", **_context())
+    return _render("ui/docs.html")
@@ -5,6 +5,7 @@ from flask import Blueprint, request, jsonify
 
 from porpulsion import state, tls
 from porpulsion.models import RemoteApp, RemoteAppSpec
+from porpulsion.settings_lists import split_csv, split_csv_set
 from porpulsion.channel import get_channel
 from porpulsion.k8s.executor import (
     run_workload, delete_workload, scale_workload, get_deployment_status, get_pod_logs,
@@ -58,13 +59,12 @@ def _check_image_policy(image: str) -> str | None:
     """Check image against allowed/blocked prefix lists. Returns error string or None."""
     s = state.settings
 
-    blocked = [p.strip() for p in s.blocked_images.split(",") if p.strip()]
-    for prefix in blocked:
-        if image.startswith(prefix):
-            return f"Image '{image}' is blocked by this cluster's policy"
+    blocked = split_csv(s.blocked_images)
+    if blocked and image.startswith(blocked):
+        return f"Image '{image}' is blocked by this cluster's policy"
 
-    allowed = [p.strip() for p in s.allowed_images.split(",") if p.strip()]
-    if allowed and not any(image.startswith(p) for p in allowed):
+    allowed = split_csv(s.allowed_images)
+    if allowed and not image.startswith(allowed):
         return (f"Image '{image}' is not in this cluster's allowed image list "
                 f"({', '.join(allowed)})")
 
@@ -100,7 +100,7 @@ def _check_resource_quota(spec: RemoteAppSpec, source_peer: str = "") -> str | N
     )
 
     # Allowed source peers
-    allowed_peers = [p.strip() for p in s.allowed_source_peers.split(",") if p.strip()]
+    allowed_peers = split_csv_set(s.allowed_source_peers)
     if allowed_peers and source_peer and source_peer not in allowed_peers:
         return f"Peer '{source_peer}' is not permitted to submit workloads to this cluster"
 
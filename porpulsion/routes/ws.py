@@ -8,16 +8,44 @@ manager.
 """
 import base64
 import logging
+import threading
 
-from flask import Blueprint, request
-from flask_sock import Sock
+from flask import request
 
 from porpulsion import state
 from porpulsion.tls import cert_fingerprint
 
 log = logging.getLogger("porpulsion.routes.ws")
 
-bp = Blueprint("ws", __name__)
+
+# Trust index: CA fingerprint -> peer name. Rebuilt only when the set of
+# (peer name, CA PEM) pairs changes, so a WS connect is a single dict lookup
+# instead of re-parsing every stored peer CA.
+_trust_key: tuple = ()
+_trust_index: dict[str, str] = {}
+_trust_lock = threading.Lock()
+
+
+def _peer_trust_index() -> dict[str, str]:
+    """Return the fingerprint -> peer name map, swapping in a new one if peers changed."""
+    global _trust_key, _trust_index
+    key = tuple((p.name, p.ca_pem) for p in list(state.peers.values()))
+    if key == _trust_key:
+        return _trust_index
+    with _trust_lock:
+        if key == _trust_key:
+            return _trust_index
+        index: dict[str, str] = {}
+        for name, ca_pem in key:
+            if not ca_pem:
+                log.debug("WS auth: peer %s has no CA stored — skipping", name)
+                continue
+            try:
+                index[cert_fingerprint(ca_pem)] = name
+            except Exception as e:
+                log.debug("WS auth: could not fingerprint CA for peer %s: %s", name, e)
+        _trust_index, _trust_key = index, key
+        return index
 
 
 def _identify_peer_by_ca(ca_pem: str) -> str | None:
@@ -29,20 +57,11 @@ def _identify_peer_by_ca(ca_pem: str) -> str | None:
     except Exception as e:
         log.warning("WS auth: could not fingerprint incoming CA: %s", e)
         return None
-    for peer in state.peers.values():
-        if not peer.ca_pem:
-            log.debug("WS auth: peer %s has no CA stored — skipping", peer.name)
-            continue
-        try:
-            stored_fp = cert_fingerprint(peer.ca_pem)
-            if stored_fp == incoming_fp:
-                return peer.name
-        except Exception as e:
-            log.debug("WS auth: could not fingerprint CA for peer %s: %s", peer.name, e)
-            continue
-    log.debug("WS auth: no peer matched incoming_fp=%s (peers=%s)",
-              incoming_fp[:16], list(state.peers.keys()))
-    return None
+    peer_name = _peer_trust_index().get(incoming_fp)
+    if peer_name is None:
+        log.debug("WS auth: no peer matched incoming_fp=%s (peers=%s)",
+                  incoming_fp[:16], list(state.peers.keys()))
+    return peer_name
 
 
 def peer_ws(ws):
@@ -74,5 +93,5 @@ def peer_ws(ws):
     from porpulsion.channel import accept_channel
     # accept_channel calls attach_inbound which blocks in this handler thread
     # until the connection closes (simple_websocket requires recv on its own thread).
-    accept_channel(peer_name, ws)
+    accept_channel(peer_name, ws, codec=request.headers.get("X-Channel-Codec", ""))
     log.info("WS channel closed for peer %s", peer_name)
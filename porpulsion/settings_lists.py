@@ -0,0 +1,23 @@
+"""
+Parsed views of the comma-separated list settings.
+
+AgentSettings keeps allowed_images, blocked_images, allowed_source_peers and
+allowed_tunnel_peers as the raw strings the operator typed. These helpers
+turn a value into its items, memoized on the raw string: the lists are
+re-checked on every submission and proxied request but only change when
+settings are saved, so no invalidation is needed. Results are shared between
+callers and therefore immutable.
+"""
+import functools
+
+
+@functools.lru_cache(maxsize=64)
+def split_csv(value: str) -> tuple[str, ...]:
+    """Split a comma-separated value into its stripped, non-empty items, in order."""
+    return tuple(t for t in (p.strip() for p in value.split(",")) if t)
+
+
+@functools.lru_cache(maxsize=64)
+def split_csv_set(value: str) -> frozenset[str]:
+    """split_csv() as a frozenset, for membership checks."""
+    return frozenset(split_csv(value))
@@ -5,6 +5,7 @@ All route modules import from here so they share the same live dicts.
 Config constants (AGENT_NAME, SELF_URL, etc.) are set once at startup
 by porpulsion/agent.py and read by routes at call time.
 """
+from collections import deque
 from typing import TYPE_CHECKING
 from porpulsion.models import Peer, RemoteApp, TunnelRequest, AgentSettings
 if TYPE_CHECKING:
@@ -31,5 +32,5 @@ invite_token: str = ""
 # peer_name -> PeerChannel (live WebSocket connection to that peer)
 peer_channels: "dict[str, PeerChannel]" = {}
 
-# In-app notifications — newest first, capped at 50
-notifications: list[dict] = []
+# In-app notifications — newest first, capped at 50 (deque drops the oldest)
+notifications: deque[dict] = deque(maxlen=50)
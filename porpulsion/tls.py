@@ -8,8 +8,9 @@ for the WebSocket channel (authenticated by CA fingerprint). This gives
 full mutual authentication with no external dependencies.
 """
 import base64
-import os
 import datetime
+import functools
+import os
 import ipaddress
 from cryptography import x509
 from cryptography.x509.oid import NameOID, ExtendedKeyUsageOID
@@ -109,26 +110,37 @@ def write_temp_pem(pem_bytes: bytes, name: str) -> str:
     return path
 
 
-def cert_fingerprint(cert_pem: str | bytes) -> str:
-    """Return the SHA-256 hex fingerprint of a PEM-encoded certificate."""
+@functools.lru_cache(maxsize=256)
+def load_ca_cert(cert_pem: str | bytes) -> x509.Certificate:
+    """
+    Parse a peer CA certificate from PEM.
+
+    Memoized on the PEM itself — peer CAs are long-lived, so the X.509 parse
+    happens once per CA rather than once per handshake or peer lookup.
+    """
     if isinstance(cert_pem, str):
         cert_pem = cert_pem.encode()
-    from cryptography.x509 import load_pem_x509_certificate
-    cert = load_pem_x509_certificate(cert_pem)
-    return cert.fingerprint(hashes.SHA256()).hex()
+    return x509.load_pem_x509_certificate(cert_pem)
+
+
+@functools.lru_cache(maxsize=128)
+def cert_fingerprint(cert_pem: str | bytes) -> str:
+    """
+    Return the SHA-256 hex fingerprint of a PEM-encoded certificate.
+
+    Memoized on the PEM itself — the same handful of peer CAs are fingerprinted
+    on every handshake, WS connect and /token call.
+    """
+    return load_ca_cert(cert_pem).fingerprint(hashes.SHA256()).hex()
 
 
 _CREDENTIALS_SECRET = "porpulsion-credentials"
 
 
 def _k8s_core_v1():
-    """Return a CoreV1Api client, loading config lazily."""
-    from kubernetes import client, config as kube_config
-    try:
-        kube_config.load_incluster_config()
-    except Exception:
-        kube_config.load_kube_config()
-    return client.CoreV1Api()
+    """The executor's shared CoreV1Api (imported lazily; it loads kube config)."""
+    from porpulsion.k8s.executor import core_v1
+    return core_v1
 
 
 def _save_credentials_secret(core_v1, namespace: str,